@@ -0,0 +1,161 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, func, insert, delete, select
+from sqlalchemy.dialects import mysql, sqlite, postgresql
+from sqlalchemy.orm import Session
+
+from models import Store, StoreAggregate
+from geo_utils import cells_to_ranges
+
+logger = logging.getLogger(__name__)
+
+# 집계 차원 코드 컬럼 -> 표시용 이름 컬럼
+AGGREGATE_DIMENSIONS = {
+    "ctprvnCd": "brtcNm",
+    "sggCd": "sggNm",
+    "adongCd": "adongNm",
+    "indsLclsCd": "indsLclsNm",
+    "indsMclsCd": "indsMclsNm",
+    "indsSclsCd": "indsSclsNm",
+}
+
+# 집계 테이블 유니크 키 컬럼
+AGGREGATE_KEY_FIELDS = list(AGGREGATE_DIMENSIONS) + ["geohash6"]
+
+def geohash_range_filter(column, ranges: List[Tuple[str, Optional[str]]]):
+    """geohash [하한, 상한) 구간 목록 조건"""
+    return or_(*[
+        and_(column >= lower, column < upper) if upper else column >= lower
+        for lower, upper in ranges
+    ])
+
+def aggregate_key(row) -> Tuple[str, ...]:
+    """상가 행(dict 또는 조회 결과 행)의 집계 키"""
+    get = row.get if isinstance(row, dict) else lambda field: getattr(row, field, None)
+    geohash = get("geohash") or ""
+    return tuple(get(field) or "" for field in AGGREGATE_DIMENSIONS) + (geohash[:6],)
+
+class StoreAggregator:
+    """지역/업종/geohash 셀별 상가 수 집계 관리 및 조회"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, rows: List[Dict], old_rows: Dict[str, object]):
+        """변경된 상가 행의 집계 증감 반영 (old_rows: bizesId -> 변경 전 행, 커밋은 호출측에서)"""
+        deltas = {}
+        names = {}
+        for row in rows:
+            new_key = aggregate_key(row)
+            old = old_rows.get(row["bizesId"])
+            if old is not None:
+                old_key = aggregate_key(old)
+                if old_key == new_key:
+                    continue
+                deltas[old_key] = deltas.get(old_key, 0) - 1
+            deltas[new_key] = deltas.get(new_key, 0) + 1
+            names[new_key] = {name: row.get(name) for name in AGGREGATE_DIMENSIONS.values()}
+
+        empty_names = dict.fromkeys(AGGREGATE_DIMENSIONS.values())
+        values = [
+            {**dict(zip(AGGREGATE_KEY_FIELDS, key)), **names.get(key, empty_names), "store_count": delta}
+            for key, delta in deltas.items() if delta
+        ]
+        if values:
+            self.db.execute(self._build_upsert_statement(values))
+
+    def _build_upsert_statement(self, values: List[Dict]):
+        """DB 종류별 집계 증감 upsert 구문 생성 (기존 행은 상가 수만 더함)"""
+        dialect = self.db.get_bind().dialect.name
+
+        if dialect in ("mysql", "mariadb"):
+            stmt = mysql.insert(StoreAggregate).values(values)
+            return stmt.on_duplicate_key_update(
+                store_count=StoreAggregate.store_count + stmt.inserted.store_count
+            )
+
+        if dialect in ("sqlite", "postgresql"):
+            dialect_module = sqlite if dialect == "sqlite" else postgresql
+            stmt = dialect_module.insert(StoreAggregate).values(values)
+            return stmt.on_conflict_do_update(
+                index_elements=[getattr(StoreAggregate, field) for field in AGGREGATE_KEY_FIELDS],
+                set_={"store_count": StoreAggregate.store_count + stmt.excluded.store_count}
+            )
+
+        raise ValueError(f"집계 upsert를 지원하지 않는 데이터베이스입니다: {dialect}")
+
+    def rebuild(self) -> int:
+        """stores 테이블 전체를 다시 집계"""
+        key_columns = [func.coalesce(getattr(Store, field), "") for field in AGGREGATE_DIMENSIONS]
+        key_columns.append(func.coalesce(func.substr(Store.geohash, 1, 6), ""))
+        name_columns = [func.max(getattr(Store, name)) for name in AGGREGATE_DIMENSIONS.values()]
+
+        self.db.execute(delete(StoreAggregate))
+        self.db.execute(insert(StoreAggregate).from_select(
+            AGGREGATE_KEY_FIELDS + list(AGGREGATE_DIMENSIONS.values()) + ["store_count"],
+            select(*key_columns, *name_columns, func.count(Store.id)).group_by(*key_columns)
+        ))
+        self.db.commit()
+
+        groups = self.db.query(func.count(StoreAggregate.id)).scalar()
+        logger.info(f"상가 집계 재생성 완료: {groups}개 그룹")
+        return groups
+
+    def is_consistent(self) -> bool:
+        """집계 상가 수 합계가 stores 행 수와 같은지 확인"""
+        aggregated = self.db.query(func.coalesce(func.sum(StoreAggregate.store_count), 0)).scalar()
+        stores = self.db.query(func.count(Store.id)).scalar()
+        if int(aggregated) == stores:
+            return True
+        logger.warning(f"상가 집계 불일치: 집계 {aggregated}건, 상가 {stores}건")
+        return False
+
+    def ensure_built(self) -> bool:
+        """집계 합계가 상가 수와 다르면(집계가 비어 있는 경우 포함) 재생성"""
+        if self.is_consistent():
+            return False
+        self.rebuild()
+        return True
+
+    def counts(self, group_by: List[str] = None, filters: Dict[str, str] = None,
+               geohash_cells: List[str] = None, limit: int = None) -> List[Dict]:
+        """조건별 상가 수 (group_by 차원별 분해, 상가 수 내림차순)
+
+        group_by/filters는 AGGREGATE_DIMENSIONS의 코드 컬럼만 사용할 수 있고,
+        geohash_cells(6자리 이하 셀 목록)를 주면 해당 셀 안의 상가만 센다.
+        """
+        group_by = group_by or []
+        filters = filters or {}
+        for field in list(group_by) + list(filters):
+            if field not in AGGREGATE_DIMENSIONS:
+                raise ValueError(f"지원하지 않는 집계 기준입니다: {field}")
+
+        columns = []
+        for field in group_by:
+            columns.append(getattr(StoreAggregate, field))
+            columns.append(func.max(getattr(StoreAggregate, AGGREGATE_DIMENSIONS[field])))
+        total = func.sum(StoreAggregate.store_count)
+
+        query = self.db.query(*columns, total).filter(StoreAggregate.store_count > 0)
+        for field, value in filters.items():
+            query = query.filter(getattr(StoreAggregate, field) == value)
+        if geohash_cells is not None:
+            if not geohash_cells:
+                return []
+            query = query.filter(geohash_range_filter(StoreAggregate.geohash6, cells_to_ranges(geohash_cells)))
+        if group_by:
+            group_columns = [getattr(StoreAggregate, field) for field in group_by]
+            query = query.group_by(*group_columns).order_by(total.desc(), *group_columns)
+        if limit:
+            query = query.limit(limit)
+
+        result = []
+        for row in query.all():
+            item = {}
+            for i, field in enumerate(group_by):
+                item[field] = row[i * 2]
+                item[AGGREGATE_DIMENSIONS[field]] = row[i * 2 + 1]
+            item["storeCount"] = int(row[-1] or 0)
+            result.append(item)
+        return result
@@ -1,34 +1,143 @@
 import requests
+from requests.adapters import HTTPAdapter
 import xml.etree.ElementTree as ET
 import json
 import time
+import random
 import logging
-from typing import List, Dict, Optional
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import List, Dict, Iterator, Optional
 import os
 from dotenv import load_dotenv
 
+try:
+    import ijson  # 증분 JSON 파서 (선택사항)
+except ImportError:
+    ijson = None
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# HTTP 연결 풀 / 재시도 설정
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", 10))
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", 5))
+API_BACKOFF_BASE = float(os.getenv("API_BACKOFF_BASE", 0.5))
+API_BACKOFF_MAX = float(os.getenv("API_BACKOFF_MAX", 30))
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", 30))
+
+# 재시도 대상 HTTP 상태코드
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
 class StoreAPIClient:
     """소상공인시장진흥공단 상가(상권)정보 API 클라이언트"""
     
-    def __init__(self):
+    def __init__(self, pool_size: int = API_POOL_SIZE, max_retries: int = API_MAX_RETRIES):
         self.base_url = "http://apis.data.go.kr/B553077/api/open/sdsc2"
         self.service_key = os.getenv("OPEN_API_SERVICE_KEY")
         if not self.service_key:
             raise ValueError("OPEN_API_SERVICE_KEY 환경변수가 설정되지 않았습니다.")
+        
+        self.session = self._create_session(pool_size)
+        self.max_retries = max_retries
+        
+        # 엔드포인트별 응답시간 통계
+        self._latency_stats = {}
+        self._latency_lock = threading.Lock()
+    
+    def _create_session(self, pool_size: int) -> requests.Session:
+        """keep-alive 연결 풀 세션 생성"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    
+    def close(self):
+        """세션 연결 풀 정리"""
+        self.session.close()
+    
+    def _get_retry_delay(self, attempt: int, response: requests.Response = None) -> float:
+        """재시도 대기시간 계산 (Retry-After 우선, 없으면 지수 백오프 + 지터)"""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), API_BACKOFF_MAX)
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+                    return min(max(delay, 0.0), API_BACKOFF_MAX)
+                except (TypeError, ValueError):
+                    pass
+        
+        delay = min(API_BACKOFF_BASE * (2 ** attempt), API_BACKOFF_MAX)
+        return random.uniform(0, delay)  # full jitter
+    
+    def _record_latency(self, endpoint: str, elapsed: float, success: bool):
+        """엔드포인트별 응답시간 기록"""
+        with self._latency_lock:
+            stats = self._latency_stats.setdefault(endpoint, {
+                "count": 0, "errors": 0, "total_time": 0.0, "max_time": 0.0
+            })
+            stats["count"] += 1
+            stats["total_time"] += elapsed
+            stats["max_time"] = max(stats["max_time"], elapsed)
+            if not success:
+                stats["errors"] += 1
+    
+    def get_latency_stats(self) -> Dict:
+        """엔드포인트별 요청수/오류수/평균·최대 응답시간 조회"""
+        with self._latency_lock:
+            return {
+                endpoint: {
+                    "count": stats["count"],
+                    "errors": stats["errors"],
+                    "avg_time": stats["total_time"] / stats["count"] if stats["count"] else 0.0,
+                    "max_time": stats["max_time"]
+                }
+                for endpoint, stats in self._latency_stats.items()
+            }
+    
+    def _get(self, endpoint: str, params: Dict, **kwargs) -> requests.Response:
+        """일시적 오류(연결 실패, 타임아웃, 429/5xx)를 재시도하는 GET 요청"""
+        url = f"{self.base_url}/{endpoint}"
+        
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            response = None
+            try:
+                response = self.session.get(url, params=params, timeout=API_TIMEOUT, **kwargs)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    self._record_latency(endpoint, time.perf_counter() - start, True)
+                    return response
+                error = requests.exceptions.HTTPError(f"{response.status_code} 응답", response=response)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+            except requests.exceptions.RequestException:
+                self._record_latency(endpoint, time.perf_counter() - start, False)
+                raise
+            
+            self._record_latency(endpoint, time.perf_counter() - start, False)
+            if attempt == self.max_retries:
+                raise error
+            
+            delay = self._get_retry_delay(attempt, response)
+            if response is not None:
+                response.close()
+            logger.warning(f"API 요청 재시도 {attempt + 1}/{self.max_retries} ({endpoint}): {error}, {delay:.2f}초 대기")
+            time.sleep(delay)
     
     def _make_request(self, endpoint: str, params: Dict) -> Optional[Dict]:
         """API 요청 실행"""
-        url = f"{self.base_url}/{endpoint}"
         params["ServiceKey"] = self.service_key
         params["type"] = "json"  # JSON 형태로 응답 요청
         
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
+            response = self._get(endpoint, params)
             
             # JSON 응답 파싱
             if response.headers.get('content-type', '').startswith('application/json'):
@@ -61,24 +170,145 @@ class StoreAPIClient:
                     result[child.tag] = child_dict
         return result
     
+    def get_page(self, endpoint: str, params: Dict, page_no: int = 1,
+                 num_of_rows: int = 1000) -> Optional[Dict]:
+        """목록형 API 페이지 조회 (totalCount, 결과코드 포함)"""
+        params = dict(params, pageNo=page_no, numOfRows=num_of_rows)
+        
+        response = self._make_request(endpoint, params)
+        if not response or "body" not in response:
+            return None
+        
+        body = response["body"]
+        items = body.get("items") or []
+        if isinstance(items, dict):
+            # XML 응답은 items/item 구조
+            items = items.get("item", items)
+        if isinstance(items, dict):
+            items = [items]  # 단일 항목인 경우 리스트로 변환
+        
+        try:
+            total_count = int(body.get("totalCount") or 0)
+        except (ValueError, TypeError):
+            total_count = 0
+        
+        header = response.get("header") or {}
+        return {
+            "totalCount": total_count,
+            "items": items,
+            "resultCode": header.get("resultCode"),
+            "resultMsg": header.get("resultMsg")
+        }
+    
+    def iter_page_items(self, endpoint: str, params: Dict, page_no: int = 1,
+                        num_of_rows: int = 1000, meta: Dict = None) -> Iterator[Dict]:
+        """목록형 API 페이지를 스트리밍 파싱하여 항목을 하나씩 반환
+
+        응답 전체를 메모리에 올리지 않고 XML은 iterparse, JSON은 ijson으로 파싱한다.
+        meta가 주어지면 파싱 중 확인한 totalCount와 결과코드(resultCode, resultMsg)를 기록한다.
+        오류 응답(인증키 오류, 트래픽 초과 등)은 HTTP 200이어도 totalCount가 없으므로 호출측에서 확인해야 한다.
+        """
+        params = dict(
+            params,
+            pageNo=page_no,
+            numOfRows=num_of_rows,
+            ServiceKey=self.service_key,
+            type="json"
+        )
+        meta = meta if meta is not None else {}
+        
+        response = self._get(endpoint, params, stream=True)
+        try:
+            response.raw.decode_content = True  # gzip 등 전송 인코딩 해제
+            if response.headers.get('content-type', '').startswith('application/json'):
+                yield from self._iter_json_items(response.raw, meta)
+            else:
+                yield from self._iter_xml_items(response.raw, meta)
+        finally:
+            response.close()
+    
+    def get_stores_page(self, div_id: str, key: str, page_no: int = 1,
+                        num_of_rows: int = 1000) -> Optional[Dict]:
+        """행정구역 단위 상가업소 페이지 조회 (totalCount 포함)"""
+        return self.get_page("storeListInDong", {"divId": div_id, "key": key}, page_no, num_of_rows)
+    
+    def iter_stores_page(self, div_id: str, key: str, page_no: int = 1,
+                         num_of_rows: int = 1000, meta: Dict = None) -> Iterator[Dict]:
+        """행정구역 단위 상가업소 페이지를 스트리밍 파싱하여 항목을 하나씩 반환"""
+        return self.iter_page_items(
+            "storeListInDong", {"divId": div_id, "key": key}, page_no, num_of_rows, meta
+        )
+    
+    def _iter_xml_items(self, stream, meta: Dict) -> Iterator[Dict]:
+        """XML 응답에서 item 요소를 하나씩 변환하여 반환"""
+        parents = []
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            if event == "start":
+                parents.append(elem)
+                continue
+            
+            parents.pop()
+            if elem.tag == "item":
+                yield {child.tag: child.text for child in elem}
+                # 처리한 항목은 트리에서 제거하여 메모리 사용량 유지
+                if parents:
+                    parents[-1].remove(elem)
+            elif elem.tag == "totalCount":
+                meta["totalCount"] = int(elem.text or 0)
+            elif elem.tag in ("resultCode", "returnReasonCode"):
+                # returnReasonCode: OpenAPI_ServiceResponse 공통 오류 응답
+                meta["resultCode"] = elem.text
+            elif elem.tag in ("resultMsg", "returnAuthMsg"):
+                meta["resultMsg"] = elem.text
+    
+    def _iter_json_items(self, stream, meta: Dict) -> Iterator[Dict]:
+        """JSON 응답에서 body.items 항목을 하나씩 반환"""
+        if ijson is None:
+            # ijson 미설치시 전체 파싱으로 대체
+            response = json.load(stream)
+            header = response.get("header") or {}
+            if "resultCode" in header:
+                meta["resultCode"] = header["resultCode"]
+                meta["resultMsg"] = header.get("resultMsg")
+            body = response.get("body") or {}
+            if "totalCount" in body:
+                meta["totalCount"] = int(body.get("totalCount") or 0)
+            items = body.get("items") or []
+            yield from ([items] if isinstance(items, dict) else items)
+            return
+        
+        builder = None
+        item_prefix = None
+        for prefix, event, value in ijson.parse(stream, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if event == "end_map" and prefix == item_prefix:
+                    yield builder.value
+                    builder = None
+                continue
+            
+            if event == "start_map" and prefix in ("body.items.item", "body.items"):
+                # 배열 원소(body.items.item) 또는 단일 항목(body.items)
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                item_prefix = prefix
+            elif prefix == "body.totalCount" and event in ("number", "string"):
+                meta["totalCount"] = int(value or 0)
+            elif prefix == "header.resultCode" and event in ("number", "string"):
+                meta["resultCode"] = str(value)
+            elif prefix == "header.resultMsg" and event == "string":
+                meta["resultMsg"] = value
+    
     def get_stores_by_dong(self, signgu_cd: str, adong_cd: str = None, 
                           page_no: int = 1, num_of_rows: int = 1000) -> Optional[List[Dict]]:
         """행정동 단위 상가업소 조회"""
-        params = {
-            "divId": "adongCd" if adong_cd else "signguCd",
-            "key": adong_cd if adong_cd else signgu_cd,
-            "pageNo": page_no,
-            "numOfRows": num_of_rows
-        }
-        
-        response = self._make_request("storeListInDong", params)
-        if response and "body" in response and "items" in response["body"]:
-            items = response["body"]["items"]
-            if isinstance(items, list):
-                return items
-            elif isinstance(items, dict):
-                return [items]  # 단일 항목인 경우 리스트로 변환
-        return []
+        page = self.get_stores_page(
+            "adongCd" if adong_cd else "signguCd",
+            adong_cd if adong_cd else signgu_cd,
+            page_no,
+            num_of_rows
+        )
+        return page["items"] if page else []
 
 # 지역코드 매핑 (일부 예시)
 REGION_CODES = {
@@ -0,0 +1,96 @@
+"""
+JSON 응답 직렬화 벤치마크
+- 상가 목록 응답과 같은 모양의 합성 데이터를 페이지 크기별로 생성
+- 기존 경로(jsonable_encoder + JSONResponse), 변환 생략(JSONResponse), ORJSONResponse의 인코딩 시간 비교
+- 응답 크기(원본/gzip/brotli) 비교
+
+사용법: python benchmark_json.py [반복 횟수] [페이지 크기...]
+"""
+
+import sys
+import gzip
+import time
+import random
+import statistics
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from data_service import STORE_RESPONSE_FIELDS
+from responses import orjson
+
+try:
+    import brotli  # brotli 크기 비교 (선택사항)
+except ImportError:
+    brotli = None
+
+# 좌표 컬럼 외에는 문자열 (코드/이름/주소)
+FLOAT_FIELDS = {"lon", "lat"}
+
+def make_page(size: int) -> dict:
+    """상가 목록 응답 한 페이지 (storeListInDong 형식)"""
+    random.seed(size)
+    rows = []
+    for i in range(size):
+        row = {}
+        for field in STORE_RESPONSE_FIELDS:
+            if field in FLOAT_FIELDS:
+                row[field] = random.uniform(126.0, 128.0) if field == "lon" else random.uniform(35.0, 38.0)
+            elif field == "bizesNm":
+                row[field] = f"상가{i} {random.choice(['치킨', '카페', '편의점', '미용실'])}"
+            else:
+                row[field] = f"{field}-{random.randint(0, 99999):05d}"
+        rows.append(row)
+    return {"storeListInDong": {
+        "list_total_count": size * 10,
+        "total_count_estimated": False,
+        "row": rows,
+        "next_cursor": "WzEwMDBd"
+    }}
+
+def encoders():
+    """비교 대상 인코딩 경로"""
+    paths = {
+        "encoder+json": lambda content: JSONResponse(jsonable_encoder(content)).body,
+        "json": lambda content: JSONResponse(content).body,
+    }
+    if orjson is not None:
+        paths["orjson"] = lambda content: ORJSONResponse(content).body
+    return paths
+
+def measure(encode, content, repeat: int) -> float:
+    """평균 인코딩 시간 (ms)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode(content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(timings)
+
+def run(page_sizes, repeat: int):
+    paths = encoders()
+    if orjson is None:
+        print("orjson 패키지가 없어 orjson 경로는 건너뜁니다.")
+
+    for size in page_sizes:
+        content = make_page(size)
+        print(f"\n페이지 크기 {size:,}행")
+        baseline = None
+        for name, encode in paths.items():
+            elapsed = measure(encode, content, repeat)
+            baseline = baseline or elapsed
+            print(f"  {name:>13}: 평균 {elapsed:8.3f}ms ({baseline / elapsed:4.1f}배)")
+
+        body = paths["json"](content)
+        sizes = f"원본 {len(body):,}B, gzip {len(gzip.compress(body, 6)):,}B"
+        if brotli is not None:
+            sizes += f", brotli {len(brotli.compress(body, quality=4)):,}B"
+        print(f"  응답 크기: {sizes}")
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    page_sizes = [int(size) for size in sys.argv[2:]] or [10, 100, 1000, 5000]
+    run(page_sizes, repeat)
+
+if __name__ == "__main__":
+    main()
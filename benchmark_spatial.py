@@ -0,0 +1,108 @@
+"""
+공간 조회 벤치마크
+- 합성 상가 데이터(기본 200만건)를 SQLite 파일 DB에 생성
+- 기존 lat/lon BETWEEN 조회와 geohash 인덱스 구간 조회의 응답시간 비교
+
+사용법: python benchmark_spatial.py [행 수] [조회 횟수]
+"""
+
+import os
+import sys
+import time
+import random
+import statistics
+import tempfile
+
+from sqlalchemy import create_engine, and_, select, func, text
+
+from models import Base, Store
+from geo_utils import encode_geohash
+from data_service import bbox_filter
+
+# 한반도 남측 대략적 범위
+MIN_LAT, MAX_LAT = 33.0, 38.6
+MIN_LON, MAX_LON = 124.6, 131.9
+
+def create_synthetic_db(path: str, rows: int, batch_size: int = 50000):
+    """합성 상가 데이터 생성"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+
+    random.seed(42)
+    # 실제 분포처럼 수도권(약 절반)과 지방 도시 중심 주변에 몰리도록 클러스터 생성
+    centers = [(37.55, 126.98, 0.12)] * 30 + [
+        (random.uniform(MIN_LAT, MAX_LAT), random.uniform(MIN_LON, MAX_LON), 0.05) for _ in range(30)
+    ]
+
+    with engine.begin() as conn:
+        for start in range(0, rows, batch_size):
+            batch = []
+            for i in range(start, min(start + batch_size, rows)):
+                center_lat, center_lon, sigma = random.choice(centers)
+                lat = min(max(random.gauss(center_lat, sigma), MIN_LAT), MAX_LAT)
+                lon = min(max(random.gauss(center_lon, sigma), MIN_LON), MAX_LON)
+                batch.append({
+                    "bizesId": f"BENCH{i:09d}",
+                    "bizesNm": f"상가{i}",
+                    "lat": lat,
+                    "lon": lon,
+                    "geohash": encode_geohash(lat, lon)
+                })
+            conn.execute(Store.__table__.insert(), batch)
+            print(f"  {min(start + batch_size, rows):,} / {rows:,}행 생성")
+        conn.execute(text("ANALYZE"))
+
+    return engine
+
+# 후보 조회 컬럼 (반경/다각형 조회는 후보의 id와 좌표만 읽은 뒤 정밀 필터링)
+CANDIDATE_COLUMNS = (Store.id, Store.lat, Store.lon)
+
+def between_query(minx, miny, maxx, maxy):
+    """기존 방식: lat/lon BETWEEN (idx_store_coord)"""
+    return select(*CANDIDATE_COLUMNS).where(
+        and_(Store.lat.between(miny, maxy), Store.lon.between(minx, maxx))
+    )
+
+def geohash_query(minx, miny, maxx, maxy):
+    """geohash 인덱스 구간 + 좌표 범위 (data_service.bbox_filter 사용)"""
+    return select(*CANDIDATE_COLUMNS).where(bbox_filter(minx, miny, maxx, maxy))
+
+def run(engine, query_count: int):
+    """실제 상가 위치 주변 반경(0.2~2km) 사각형 조회 시간 비교"""
+    random.seed(7)
+    with engine.connect() as conn:
+        max_id = conn.execute(select(func.max(Store.id))).scalar()
+        boxes = []
+        for _ in range(query_count):
+            lat, lon = conn.execute(
+                select(Store.lat, Store.lon).where(Store.id == random.randint(1, max_id))
+            ).one()
+            half = random.uniform(200, 2000) / 111000
+            boxes.append((lon - half, lat - half, lon + half, lat + half))
+
+        timings = {"between": [], "geohash": []}
+        for box in boxes:
+            counts = []
+            for name, builder in (("between", between_query), ("geohash", geohash_query)):
+                start = time.perf_counter()
+                counts.append(len(conn.execute(builder(*box)).fetchall()))
+                timings[name].append((time.perf_counter() - start) * 1000)
+            assert counts[0] == counts[1], f"결과 불일치: {counts}"
+
+    for name, values in timings.items():
+        print(f"{name:>8}: 평균 {statistics.mean(values):8.2f}ms, "
+              f"중앙값 {statistics.median(values):8.2f}ms, 최대 {max(values):8.2f}ms")
+    print(f"속도 향상(평균): {statistics.mean(timings['between']) / statistics.mean(timings['geohash']):.1f}배")
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_spatial.db")
+    print(f"합성 데이터 {rows:,}행 생성: {path}")
+    engine = create_synthetic_db(path, rows)
+    run(engine, query_count)
+    os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import select, update
+
+from models import DataVersion
+
+try:
+    import redis  # 공유 캐시 (선택사항)
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# 공유 데이터 버전 이름 / API 워커의 버전 확인 주기 (초)
+STORE_DATA_VERSION = "stores"
+DATA_VERSION_POLL_INTERVAL = float(os.getenv("DATA_VERSION_POLL_INTERVAL", 2))
+
+# 목록 전체 건수 캐시 설정
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", 300))
+COUNT_CACHE_SIZE = int(os.getenv("COUNT_CACHE_SIZE", 10000))
+
+# 응답 캐시 설정
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 300))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+RESPONSE_CACHE_SHARED_URL = os.getenv("RESPONSE_CACHE_SHARED_URL", "")  # redis://... 또는 local
+
+class CountCache:
+    """필터 조합별 전체 건수 캐시 (프로세스 단위, TTL + LRU)
+
+    version은 공유 데이터 버전(data_versions 테이블)을 따른다.
+    데이터가 바뀌면 invalidate(version)으로 새 버전을 반영해 이전 버전에서 계산한 건수를 모두 무효화한다.
+    """
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL, max_entries: int = COUNT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[int, bool]]:
+        """캐시된 (건수, 추정치 여부) 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            count, estimated, version, stored_at = entry
+            if version != self.version or time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return count, estimated
+
+    def set(self, key: Hashable, count: int, estimated: bool = False):
+        """건수 저장"""
+        with self._lock:
+            self._entries[key] = (count, estimated, self.version, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, version: int):
+        """새 데이터 버전 반영 + 전체 무효화"""
+        with self._lock:
+            self.version = version
+            self._entries.clear()
+
+# 공용 건수 캐시
+count_cache = CountCache()
+
+class LocalSharedCache:
+    """공유 캐시 대체용 프로세스 내 저장소 (Redis와 같은 get/set 인터페이스)"""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() > expires_at:
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ex: int = None):
+        with self._lock:
+            self._values[key] = (value, time.monotonic() + ex if ex else None)
+
+def create_shared_cache(url: str = RESPONSE_CACHE_SHARED_URL):
+    """공유 캐시 생성 (redis:// URL이면 Redis, local이면 프로세스 내 대체 저장소, 없으면 None)"""
+    if not url:
+        return None
+    if url == "local":
+        return LocalSharedCache()
+    if redis is None:
+        logger.warning("redis 패키지가 없어 공유 응답 캐시를 사용하지 않습니다.")
+        return None
+    return redis.Redis.from_url(url, socket_timeout=0.5)
+
+class ResponseCache:
+    """조회 API 응답 캐시
+
+    1차는 바이트 예산이 있는 프로세스 내 LRU, 2차는 선택적인 공유 캐시(Redis 등)이다.
+    키에 공유 데이터 버전(data_versions 테이블)을 포함하므로, 동기화한 프로세스가 버전을 올리면
+    API 워커가 주기적으로 새 버전을 읽어 bump_version()하는 시점부터 이전 응답은 더 이상 조회되지 않는다.
+    버전이 DB에 있으므로 Redis 없이도 다른 프로세스(수집기)의 동기화가 반영된다.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES, ttl: int = RESPONSE_CACHE_TTL, shared=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.shared = shared
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, endpoint: str, params: Dict[str, str]) -> str:
+        """엔드포인트 + 정규화된 파라미터(이름순, 빈 값 제외) 캐시 키"""
+        normalized = "&".join(f"{name}={value}" for name, value in sorted(params.items()) if value)
+        return f"response:{self.version}:{endpoint}?{normalized}"
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """캐시된 (ETag, 본문) 조회"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                etag, body, stored_at = entry
+                if time.monotonic() - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return etag, body
+                self._remove(key)
+
+        if self.shared is not None:
+            try:
+                value = self.shared.get(key)
+            except Exception as e:
+                logger.warning(f"공유 캐시 조회 실패: {e}")
+                value = None
+            if value:
+                etag, body = value.split(b"\n", 1)
+                self._store_local(key, etag.decode(), body)
+                with self._lock:
+                    self.hits += 1
+                return etag.decode(), body
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, body: bytes) -> str:
+        """응답 본문 저장 후 ETag 반환
+
+        압축 미들웨어가 캐시 바깥에서 인코딩별로 다른 본문을 만들므로 약한 ETag(W/)를 사용한다.
+        """
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+        self._store_local(key, etag, body)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, etag.encode() + b"\n" + body, ex=self.ttl)
+            except Exception as e:
+                logger.warning(f"공유 캐시 저장 실패: {e}")
+        return etag
+
+    def _store_local(self, key: str, etag: str, body: bytes):
+        """1차 캐시 저장 (예산의 1/8보다 큰 응답은 저장하지 않음)"""
+        if len(body) > self.max_bytes // 8:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (etag, body, time.monotonic())
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+    def bump_version(self, version: int):
+        """새 데이터 버전 반영 (이전 버전 응답 전체 무효화, 공유 캐시의 이전 키는 TTL로 만료)"""
+        with self._lock:
+            self.version = version
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict:
+        """캐시 적중률/사용량"""
+        with self._lock:
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared": type(self.shared).__name__ if self.shared is not None else None
+            }
+
+# 공용 응답 캐시
+response_cache = ResponseCache(shared=create_shared_cache())
+
+def bump_data_version(db) -> int:
+    """공유 데이터 버전 증가 후 새 버전 반환
+
+    상가 변경과 같은 트랜잭션 안에서 호출한다 (커밋은 호출측에서).
+    버전 행은 커밋까지 잠기므로 커밋 직전에 호출해 잠금 시간을 줄인다.
+    """
+    db.execute(
+        update(DataVersion).where(DataVersion.name == STORE_DATA_VERSION)
+        .values(version=DataVersion.version + 1)
+    )
+    return read_data_version(db)
+
+def read_data_version(conn) -> int:
+    """공유 데이터 버전 조회 (행이 없으면 0)"""
+    version = conn.execute(
+        select(DataVersion.version).where(DataVersion.name == STORE_DATA_VERSION)
+    ).scalar()
+    return version or 0
+
+_invalidate_lock = threading.Lock()
+
+def invalidate_data_caches(version: int) -> bool:
+    """공유 데이터 버전이 바뀌었으면 건수/응답 캐시 무효화 (이미 반영한 버전 이하면 무시)
+
+    쓰는 프로세스는 커밋 직후 bump_data_version()의 결과로, API 워커는 주기적으로 읽은 버전으로 호출한다.
+    """
+    with _invalidate_lock:
+        if version <= count_cache.version:
+            return False
+        count_cache.invalidate(version)
+        response_cache.bump_version(version)
+    return True
@@ -0,0 +1,120 @@
+import hashlib
+from typing import Dict, List, Tuple
+
+# === 실제 데이터베이스 구조에 맞는 업종 분류 시스템 ===
+# 실제 DB에는 대분류만 있으므로, 상가명(bizesNm)을 이용한 세부 분류
+industry_categories = {
+    "음식": {
+        "전체": [],  # 음식 전체
+        "치킨": ["치킨", "닭", "호프", "통닭", "후라이드", "양념", "BBQ", "교촌", "네네"],
+        "카페": ["카페", "커피", "스타벅스", "이디야", "커피빈", "엔젤리너스", "카페베네", "투썸", "Coffee"],
+        "한식": ["한식", "한정식", "분식", "국밥", "찌개", "백반", "삼겹살", "갈비", "불고기", "김치", "비빔밥"],
+        "중식": ["중식", "중국", "짜장면", "짬뽕", "탕수육", "양장피", "마파두부"],
+        "일식": ["일식", "초밥", "라면", "우동", "돈까스", "회", "사시미", "스시"],
+        "양식": ["양식", "스테이크", "파스타", "피자", "햄버거", "샐러드", "Pizza"],
+        "주점": ["술집", "호프", "포장마차", "노래방", "가라오케", "소주", "맥주", "Bar"],
+        "베이커리": ["빵집", "제과", "케이크", "베이커리", "파리바게트", "뚜레주르", "Bakery"],
+        "패스트푸드": ["맥도날드", "버거킹", "롯데리아", "KFC", "서브웨이", "McDonald", "Burger"]
+    },
+    "소매": {
+        "전체": [],  # 소매 전체
+        "편의점": ["편의점", "CU", "GS25", "세븐일레븐", "이마트24", "미니스톱", "Seven"],
+        "마트": ["마트", "슈퍼", "이마트", "롯데마트", "홈플러스", "하나로마트", "Mart", "Super"],
+        "의류": ["의류", "패션", "옷", "신발", "가방", "액세서리", "유니클로", "자라", "Fashion"],
+        "화장품": ["화장품", "미용", "올리브영", "아모레", "코스메틱", "Beauty"],
+        "문구": ["문구", "서점", "교보문고", "영풍문고", "학용품", "Book"],
+        "전자제품": ["전자", "핸드폰", "컴퓨터", "가전", "삼성", "LG", "Mobile"],
+        "약국": ["약국", "온누리약국", "365약국", "의약품", "Pharmacy"],
+        "기타": ["잡화", "생활용품", "가구", "인테리어", "꽃집", "선물"]
+    },
+    "생활서비스업": {
+        "전체": [],  # 생활서비스업 전체
+        "미용": ["미용실", "헤어", "네일", "피부", "마사지", "사우나", "찜질방", "Hair", "Beauty"],
+        "세탁": ["세탁소", "빨래방", "드라이클리닝", "Laundry"],
+        "수리": ["수리", "휴대폰수리", "시계수리", "신발수리", "열쇠", "Repair"],
+        "운송": ["택배", "퀵서비스", "이사", "배달", "운송", "Delivery"],
+        "청소": ["청소", "하우스클리닝", "사무실청소", "Cleaning"],
+        "기타": ["사진관", "인쇄", "복사", "자물쇠", "Photo"]
+    },
+    "숙박및음식점업": {
+        "전체": [],  # 숙박및음식점업 전체
+        "숙박": ["호텔", "모텔", "펜션", "게스트하우스", "리조트", "Hotel"],
+        "음식점": ["식당", "Restaurant", "레스토랑", "음식점", "요리"],
+        "카페": ["카페", "커피", "Coffee", "Cafe"],
+        "주점": ["술집", "호프", "Bar", "펍", "Pub"]
+    },
+    "도매및소매업": {
+        "전체": [],  # 도매및소매업 전체
+        "도매": ["도매", "총판", "유통", "납품"],
+        "소매": ["소매", "판매", "Shop", "Store"],
+        "무역": ["수출입", "무역", "통관", "Trade"],
+        "기타": ["중간유통", "대리점", "판매대행"]
+    },
+    "부동산업": {
+        "전체": [],  # 부동산업 전체
+        "부동산": ["부동산", "공인중개사", "임대", "매매", "Real Estate"],
+        "개발": ["건설", "아파트분양", "개발", "Construction"],
+        "관리": ["관리사무소", "경비", "시설관리", "Management"],
+        "기타": ["감정평가", "컨설팅"]
+    },
+    "교육": {
+        "전체": [],  # 교육 전체
+        "학원": ["학원", "교육", "과외", "입시", "Academy"],
+        "어학": ["어학원", "영어", "토익", "토플", "회화", "English"],
+        "컴퓨터": ["컴퓨터", "IT교육", "프로그래밍", "Computer"],
+        "예체능": ["피아노", "미술", "태권도", "발레", "음악", "Art"],
+        "기타": ["독서실", "도서관", "스터디룸", "Library"]
+    },
+    "보건업": {
+        "전체": [],  # 보건업 전체
+        "병원": ["병원", "의원", "클리닉", "내과", "외과", "Hospital"],
+        "치과": ["치과", "임플란트", "교정", "Dental"],
+        "한의원": ["한의원", "침술", "한방", "Oriental"],
+        "동물병원": ["동물병원", "애완동물", "수의사", "Animal"],
+        "기타": ["검진센터", "건강검진", "예방접종"]
+    },
+    "예술스포츠": {
+        "전체": [],  # 예술스포츠 전체
+        "스포츠": ["헬스장", "수영장", "골프", "테니스", "Gym", "Sports"],
+        "오락": ["노래방", "PC방", "당구장", "볼링장", "Game"],
+        "문화": ["영화관", "박물관", "전시관", "문화센터", "Cinema"],
+        "기타": ["공원", "VR체험"]
+    },
+    "하수폐기물": {
+        "전체": [],  # 하수폐기물 전체
+        "폐기물": ["폐기물", "재활용", "청소", "Waste"],
+        "환경": ["환경", "정화", "Environmental"],
+        "기타": ["기타"]
+    },
+    "일반서비스": {
+        "전체": [],  # 일반서비스 전체
+        "금융": ["은행", "보험", "증권", "대출", "ATM", "농협", "신협", "Bank"],
+        "법무": ["변호사", "법무사", "행정사", "공증", "Legal"],
+        "회계": ["회계", "세무사", "기장", "Tax"],
+        "자동차": ["자동차", "카센터", "타이어", "세차", "주유소", "Car"],
+        "기타": ["결혼정보", "장례식장", "웨딩", "Wedding"]
+    }
+}
+
+# 태그 이름 구분자 (대분류/소분류)
+TAG_SEPARATOR = "/"
+
+def category_tag(main_category: str, sub_category: str) -> str:
+    """업종 소분류 태그 이름"""
+    return f"{main_category}{TAG_SEPARATOR}{sub_category}"
+
+def category_rules() -> Dict[str, Tuple[str, List[str]]]:
+    """태그 -> (대분류, 소문자 키워드 목록) (키워드가 없는 "전체"는 제외)"""
+    rules = {}
+    for main_category, sub_categories in industry_categories.items():
+        for sub_category, keywords in sub_categories.items():
+            if keywords:
+                rules[category_tag(main_category, sub_category)] = (
+                    main_category, sorted({keyword.lower() for keyword in keywords})
+                )
+    return rules
+
+def rule_hash(main_category: str, keywords: List[str]) -> str:
+    """태그 규칙 해시 (규칙이 바뀐 태그만 다시 태깅하기 위한 비교용)"""
+    payload = "\x1f".join([main_category] + sorted(keywords))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
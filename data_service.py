@@ -1,27 +1,128 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import List, Optional, Dict
-from models import Store, StoreCreate, StoreSearch
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, func, insert, update, text, DateTime
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.dialects import mysql, sqlite, postgresql
+from typing import List, Optional, Dict, Tuple, Union
+from datetime import date, datetime, timedelta
+from models import Store, StoreAggregate, StoreNameGram, StoreCreate, StoreSearch, StoreChange, SyncCheckpoint
 from api_client import StoreAPIClient
+from harvester import StoreHarvester
+from pagination import encode_cursor, decode_cursor
+from cache import count_cache, bump_data_version, invalidate_data_caches
+from database import db_lock
+from upjong_hierarchy import upjong_hierarchy
+from aggregates import StoreAggregator, geohash_range_filter
+from name_index import StoreNameIndex
+from store_tagger import StoreTagger
+from geo_utils import (
+    encode_geohash, geohash_ranges, geohash_cover, geohash_bbox, cells_to_ranges,
+    radius_bbox, haversine_distances, prepare_polygon
+)
+import numpy as np
+import hashlib
 import logging
+import os
+from bisect import bisect_right
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# 일괄 upsert 기본 청크 크기
+DEFAULT_CHUNK_SIZE = 500
+
+# 정확한 COUNT 허용 시간 (초, MariaDB 전용). 초과하면 실행계획 예상 행 수로 대체 (다른 DB는 항상 정확한 COUNT)
+COUNT_TIMEOUT = float(os.getenv("COUNT_TIMEOUT", 2))
+
+# 일괄 조회 최대 상가업소번호 수 / IN 절 청크 크기
+STORE_BATCH_MAX = int(os.getenv("STORE_BATCH_MAX", 5000))
+STORE_BATCH_CHUNK_SIZE = 500
+
+# 상권 영역 집계시 사각형을 덮는 최대 geohash 셀 수 (집계 테이블 정밀도는 6자리)
+ZONE_COVER_CELLS = 256
+
+# 상가 데이터 컬럼 (id, 메타 컬럼 제외)
+STORE_FIELDS = [
+    'bizesId', 'bizesNm', 'brtcNm', 'sggNm', 'adongNm', 'bdongNm',
+    'lnoAdr', 'rdnmAdr', 'indsLclsCd', 'indsLclsNm', 'indsMclsCd',
+    'indsMclsNm', 'indsSclsCd', 'indsSclsNm', 'lon', 'lat', 'bldMngNo',
+    'bldNm', 'flrInfo', 'tel', 'ctprvnCd', 'sggCd', 'adongCd', 'bdongCd'
+]
+
+# 조회 응답 컬럼 (응답 필드 순서)
+STORE_RESPONSE_FIELDS = [
+    'bizesId', 'bizesNm', 'brtcNm', 'sggNm', 'adongNm', 'bdongNm',
+    'lnoAdr', 'rdnmAdr', 'lon', 'lat', 'indsLclsCd', 'indsLclsNm',
+    'indsMclsCd', 'indsMclsNm', 'indsSclsCd', 'indsSclsNm', 'bldMngNo',
+    'bldNm', 'flrInfo', 'tel', 'ctprvnCd', 'sggCd', 'adongCd', 'bdongCd'
+]
+
+def parse_store_fields(fields: Union[str, List[str], None] = None) -> List[str]:
+    """응답 컬럼 목록 검증 (쉼표 구분 문자열 또는 목록, 없으면 전체 컬럼)"""
+    if not fields:
+        return list(STORE_RESPONSE_FIELDS)
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    selected = list(dict.fromkeys(field.strip() for field in fields if field.strip()))
+    unknown = [field for field in selected if field not in STORE_RESPONSE_FIELDS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 컬럼입니다: {', '.join(unknown)}")
+    return selected or list(STORE_RESPONSE_FIELDS)
+
+@lru_cache(maxsize=256)
+def store_row_mapper(fields: Tuple[str, ...]):
+    """(fields..., 추가 컬럼) 조회 행을 응답 딕셔너리로 바꾸는 함수 (컬럼 조합별로 한 번만 생성)
+
+    zip은 fields 길이에서 멈추므로 뒤에 붙인 id 등 내부용 컬럼은 응답에 포함되지 않는다.
+    """
+    def to_dict(row) -> Dict:
+        return dict(zip(fields, row))
+    return to_dict
+
+def bbox_filter(minx: float, miny: float, maxx: float, maxy: float):
+    """사각형 범위 조건 (geohash 인덱스 구간 탐색 + 정확한 좌표 범위 확인)
+
+    lat/lon 비교는 '+ 0' 식으로 감싸 idx_store_coord(선두 컬럼 lat만 범위 탐색 가능)
+    대신 geohash 인덱스 구간으로 후보를 찾도록 한다.
+    """
+    return and_(
+        geohash_range_filter(Store.geohash, geohash_ranges(minx, miny, maxx, maxy)),
+        (Store.lat + 0).between(miny, maxy),
+        (Store.lon + 0).between(minx, maxx)
+    )
+
 class StoreDataService:
     """상가 데이터 서비스"""
     
     def __init__(self, db: Session):
         self.db = db
-        self.api_client = StoreAPIClient()
+        self._api_client = None
+        self.next_cursor = None  # 마지막 목록 조회의 다음 페이지 커서
+        self.total_count = 0  # 마지막 목록 조회의 전체 건수
+        self.total_count_estimated = False  # 전체 건수가 추정치인지 여부
+    
+    @property
+    def api_client(self) -> StoreAPIClient:
+        """공공데이터 API 클라이언트 (동기화 작업에서만 필요하므로 지연 생성)"""
+        if self._api_client is None:
+            self._api_client = StoreAPIClient()
+        return self._api_client
     
     def create_store(self, store_data: Dict) -> Store:
         """상가 정보 생성"""
         # 데이터 정제
         store_dict = self._clean_store_data(store_data)
+        store_dict["geohash"] = self._geohash(store_dict)
+        store_dict["content_hash"] = self._content_hash(store_dict)  # 다음 upsert에서 변경 없음으로 판단
         
         db_store = Store(**store_dict)
         self.db.add(db_store)
+        StoreAggregator(self.db).apply([store_dict], {})
+        StoreNameIndex(self.db).apply([store_dict], {})
+        StoreTagger(self.db).apply([store_dict], {})
+        version = bump_data_version(self.db)
         self.db.commit()
+        invalidate_data_caches(version)
         self.db.refresh(db_store)
         return db_store
     
@@ -29,16 +130,34 @@ class StoreDataService:
         """ID로 상가 조회"""
         return self.db.query(Store).filter(Store.id == store_id).first()
     
-    def sync_stores_from_api(self, signgu_cd: str, limit: int = None) -> Dict:
+    def sync_stores_from_api(self, signgu_cd: str, limit: int = None,
+                             bulk: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
         """API에서 상가 데이터 동기화"""
         logger.info(f"시군구코드 {signgu_cd}의 상가 데이터 동기화 시작")
         
-        # API에서 데이터 조회
-        stores_data = self.api_client.get_stores_by_dong(signgu_cd)
+        harvester = StoreHarvester(self.api_client, chunk_size=chunk_size)
+        
+        # 일괄 upsert 모드: 전체 페이지를 수집하며 페이지 단위로 바로 기록
+        if bulk and not limit:
+            return harvester.harvest(
+                "signguCd", signgu_cd,
+                lambda items: self.bulk_upsert_stores(items, chunk_size)
+            )
+        
+        # API에서 데이터 조회 (pageNo를 따라 전체 페이지 조회)
+        stores_data = []
+        for _, items, _ in harvester.iter_pages("signguCd", signgu_cd):
+            stores_data.extend(items or [])
+            if limit and len(stores_data) >= limit:
+                break
         
         if limit:
             stores_data = stores_data[:limit]
         
+        # 일괄 upsert 모드
+        if bulk:
+            return self.bulk_upsert_stores(stores_data, chunk_size)
+        
         created_count = 0
         error_count = 0
         
@@ -65,6 +184,289 @@ class StoreDataService:
         
         return result
     
+    def bulk_upsert_stores(self, stores_data: List[Dict], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+        """상가 데이터 일괄 upsert (청크 단위 다중행 INSERT ... ON DUPLICATE KEY UPDATE / ON CONFLICT)"""
+        chunk_size = max(1, chunk_size)
+        result = {
+            "total_processed": 0,
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "errors": 0,
+            "chunks": []
+        }
+        
+        for start in range(0, len(stores_data), chunk_size):
+            chunk_result = self._upsert_chunk(stores_data[start:start + chunk_size])
+            chunk_result["chunk"] = len(result["chunks"]) + 1
+            result["chunks"].append(chunk_result)
+            
+            for field in ("total_processed", "inserted", "updated", "unchanged", "errors"):
+                result[field] += chunk_result[field]
+        
+        logger.info(
+            f"일괄 upsert 완료: 처리 {result['total_processed']}건, 신규 {result['inserted']}건, "
+            f"갱신 {result['updated']}건, 변경없음 {result['unchanged']}건, 오류 {result['errors']}건"
+        )
+        return result
+    
+    def _upsert_chunk(self, chunk: List[Dict]) -> Dict:
+        """단일 청크 upsert 실행 (내용 해시가 같은 행은 쓰지 않음)"""
+        result = {"total_processed": len(chunk), "inserted": 0, "updated": 0, "unchanged": 0, "errors": 0}
+        now = datetime.now()
+        
+        # 정제 + 청크 내 중복 bizesId 제거 (마지막 값 우선)
+        rows = {}
+        for store_data in chunk:
+            cleaned = self._clean_store_data(store_data)
+            if not cleaned.get("bizesId"):
+                result["errors"] += 1
+                continue
+            row = {field: cleaned.get(field) for field in STORE_FIELDS}
+            row["content_hash"] = self._content_hash(row)
+            row["geohash"] = self._geohash(row)
+            row["updated_at"] = now
+            rows[cleaned["bizesId"]] = row
+        
+        if not rows:
+            return result
+        
+        try:
+            existing = dict(
+                self.db.query(Store.bizesId, Store.content_hash).filter(Store.bizesId.in_(list(rows)))
+            )
+            changed = [
+                row for bizes_id, row in rows.items()
+                if bizes_id not in existing or existing[bizes_id] != row["content_hash"]
+            ]
+            if changed:
+                old_rows = self._load_old_rows([row["bizesId"] for row in changed if row["bizesId"] in existing])
+                changes = self._collect_changes(changed, old_rows, now)
+                self.db.execute(self._build_upsert_statement(changed))
+                if changes:
+                    self.db.execute(insert(StoreChange), changes)
+                StoreAggregator(self.db).apply(changed, old_rows)
+                StoreNameIndex(self.db).apply(changed, old_rows)
+                StoreTagger(self.db).apply(changed, old_rows)
+                version = bump_data_version(self.db)
+                self.db.commit()
+                invalidate_data_caches(version)
+            
+            result["updated"] = sum(1 for row in changed if row["bizesId"] in existing)
+            result["inserted"] = len(changed) - result["updated"]
+            result["unchanged"] = len(rows) - len(changed)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"청크 upsert 오류: {e}")
+            result["errors"] += len(rows)
+        
+        return result
+    
+    def _load_old_rows(self, bizes_ids: List[str]) -> Dict:
+        """변경 전 상가 행 조회 (bizesId -> 행, 변경 이력/집계 갱신용)"""
+        if not bizes_ids:
+            return {}
+        columns = [getattr(Store, field) for field in STORE_FIELDS] + [Store.geohash]
+        return {r.bizesId: r for r in self.db.query(*columns).filter(Store.bizesId.in_(bizes_ids))}
+    
+    def _collect_changes(self, rows: List[Dict], old_rows: Dict, changed_at: datetime) -> List[Dict]:
+        """기존 행과 비교하여 필드별 변경 이력 생성"""
+        changes = []
+        for row in rows:
+            old = old_rows.get(row["bizesId"])
+            if old is None:
+                continue
+            for field in STORE_FIELDS:
+                old_value, new_value = getattr(old, field), row[field]
+                if old_value == new_value:
+                    continue
+                changes.append({
+                    "bizesId": row["bizesId"],
+                    "field": field,
+                    "old_value": None if old_value is None else str(old_value),
+                    "new_value": None if new_value is None else str(new_value),
+                    "changed_at": changed_at
+                })
+        return changes
+    
+    def _geohash(self, row: Dict) -> Optional[str]:
+        """좌표가 있으면 geohash 계산"""
+        if row.get("lat") is None or row.get("lon") is None:
+            return None
+        return encode_geohash(row["lat"], row["lon"])
+    
+    def backfill_geohash(self, batch_size: int = 1000) -> int:
+        """geohash가 비어 있는 기존 상가에 geohash 채우기"""
+        total = 0
+        last_id = 0
+        while True:
+            rows = self.db.query(Store.id, Store.lat, Store.lon).filter(
+                Store.id > last_id,
+                Store.geohash.is_(None),
+                Store.lat.isnot(None),
+                Store.lon.isnot(None)
+            ).order_by(Store.id).limit(batch_size).all()
+            if not rows:
+                break
+            
+            self.db.execute(update(Store), [
+                {"id": r.id, "geohash": encode_geohash(r.lat, r.lon)} for r in rows
+            ])
+            self.db.commit()
+            total += len(rows)
+            last_id = rows[-1].id
+        
+        if total:
+            StoreAggregator(self.db).rebuild()  # geohash 셀 차원 갱신
+            version = bump_data_version(self.db)
+            self.db.commit()
+            invalidate_data_caches(version)
+            logger.info(f"geohash 채우기 완료: {total}건")
+        return total
+    
+    def prepare_derived_tables(self):
+        """geohash/집계/상호명 색인 최초 생성 + 바뀐 태그 규칙 반영
+
+        전체 테이블을 다시 쓰는 작업이므로 API 서버 시작이 아니라 설치/수집 명령에서 실행하고,
+        여러 프로세스가 동시에 빈 테이블을 채우지 않도록 DB 잠금 안에서 실행한다.
+        """
+        with db_lock("store_derived_tables"):
+            self.backfill_geohash()
+            # 지역/업종별 집계, 상호명 검색 색인 최초 생성 (상가 수와 맞지 않으면 재생성)
+            rebuilt = StoreAggregator(self.db).ensure_built()
+            rebuilt = StoreNameIndex(self.db).ensure_built() or rebuilt
+            if rebuilt:
+                version = bump_data_version(self.db)
+                self.db.commit()
+                invalidate_data_caches(version)
+            StoreTagger(self.db).sync_rules()  # 업종 소분류 태그 규칙이 바뀌었으면 해당 태그만 재태깅
+    
+    def check_derived_tables(self) -> List[str]:
+        """설치/수집 명령(prepare_derived_tables)을 거치지 않아 비어 있는 파생 데이터 목록 (가벼운 존재 확인만)"""
+        if not self.db.query(Store.id).first():
+            return []
+        
+        problems = []
+        if self.db.query(Store.id).filter(
+            Store.geohash.is_(None), Store.lat.isnot(None), Store.lon.isnot(None)
+        ).first():
+            problems.append("geohash가 없는 상가가 있습니다 (공간 검색에서 제외됨)")
+        if not self.db.query(StoreAggregate.id).first():
+            problems.append("store_aggregates 집계 테이블이 비어 있습니다 (통계/상권 조회가 0건)")
+        if not self.db.query(StoreNameGram.bizesId).first():
+            problems.append("store_name_grams 상호명 색인이 비어 있습니다 (상호명 검색이 0건)")
+        return problems
+    
+    def _content_hash(self, row: Dict) -> str:
+        """상가 데이터 내용 해시 (변경 감지용)"""
+        payload = "\x1f".join("" if row.get(field) is None else str(row[field]) for field in STORE_FIELDS)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    
+    def _build_upsert_statement(self, rows: List[Dict]):
+        """DB 종류별 다중행 upsert 구문 생성"""
+        dialect = self.db.get_bind().dialect.name
+        update_fields = [field for field in rows[0] if field != "bizesId"]
+        
+        if dialect in ("mysql", "mariadb"):
+            stmt = mysql.insert(Store).values(rows)
+            update_set = {field: stmt.inserted[field] for field in update_fields}
+            return stmt.on_duplicate_key_update(update_set)
+        
+        if dialect in ("sqlite", "postgresql"):
+            dialect_module = sqlite if dialect == "sqlite" else postgresql
+            stmt = dialect_module.insert(Store).values(rows)
+            update_set = {field: stmt.excluded[field] for field in update_fields}
+            return stmt.on_conflict_do_update(index_elements=[Store.bizesId], set_=update_set)
+        
+        raise ValueError(f"일괄 upsert를 지원하지 않는 데이터베이스입니다: {dialect}")
+    
+    def sync_region(self, ctprvn_cd: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+        """시도 단위 전체 동기화 (중단시 연속 완료 페이지 다음부터 재개)"""
+        scope = f"storeListInDong:{ctprvn_cd}"
+        checkpoint = self._get_checkpoint(scope)
+        start_page = checkpoint.last_page + 1 if checkpoint.status == "running" else 1
+        
+        logger.info(f"{scope} 동기화 시작 (시작 페이지 {start_page})")
+        self._save_checkpoint(checkpoint, last_page=start_page - 1, status="running")
+        
+        harvester = StoreHarvester(self.api_client, chunk_size=chunk_size)
+        result = harvester.harvest(
+            "ctprvnCd", ctprvn_cd,
+            lambda items: self.bulk_upsert_stores(items, chunk_size),
+            start_page,
+            lambda page_no: self._save_checkpoint(checkpoint, last_page=page_no)
+        )
+        
+        if not result["failed_pages"]:
+            self._save_checkpoint(checkpoint, last_modified=date.today().strftime("%Y%m%d"),
+                                  status="completed")
+        return result
+    
+    def sync_incremental(self, ctprvn_cd: str = None, since: str = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+        """체크포인트 기반 증분 동기화 (수정일자별 변경분만 수집)
+
+        마지막으로 처리한 수정일자부터 오늘까지 storeListByDate 변경분을 수집한다.
+        중단된 경우 해당 일자의 연속 완료 페이지 다음부터 재개하며,
+        완료된 마지막 일자는 당일 추가 변경분을 위해 다시 확인한다(해시가 같으면 쓰지 않음).
+        """
+        scope = f"storeListByDate:{ctprvn_cd or 'all'}"
+        checkpoint = self._get_checkpoint(scope)
+        today = date.today()
+        
+        start_page = 1
+        if checkpoint.last_modified:
+            current = datetime.strptime(checkpoint.last_modified, "%Y%m%d").date()
+            if checkpoint.status == "running":
+                start_page = checkpoint.last_page + 1
+        else:
+            current = datetime.strptime(since, "%Y%m%d").date() if since else today
+        
+        logger.info(f"{scope} 증분 동기화 시작: {current:%Y%m%d}부터 (시작 페이지 {start_page})")
+        harvester = StoreHarvester(self.api_client, chunk_size=chunk_size)
+        result = {"dates": {}, "completed": True}
+        
+        while current <= today:
+            modified_date = current.strftime("%Y%m%d")
+            self._save_checkpoint(checkpoint, last_modified=modified_date,
+                                  last_page=start_page - 1, status="running")
+            
+            date_result = harvester.harvest_modified(
+                modified_date,
+                lambda items: self.bulk_upsert_stores(items, chunk_size),
+                ctprvn_cd,
+                start_page,
+                lambda page_no: self._save_checkpoint(checkpoint, last_page=page_no)
+            )
+            result["dates"][modified_date] = date_result
+            
+            if date_result["failed_pages"]:
+                # 실패 페이지가 있으면 running 상태로 남겨 다음 실행에서 재개
+                logger.warning(f"{scope} {modified_date} 실패 페이지 {date_result['failed_pages']}, 동기화 중단")
+                result["completed"] = False
+                break
+            
+            self._save_checkpoint(checkpoint, status="completed")
+            current += timedelta(days=1)
+            start_page = 1
+        
+        return result
+    
+    def _get_checkpoint(self, scope: str) -> SyncCheckpoint:
+        """동기화 체크포인트 조회 (없으면 생성)"""
+        checkpoint = self.db.query(SyncCheckpoint).filter(SyncCheckpoint.scope == scope).first()
+        if not checkpoint:
+            checkpoint = SyncCheckpoint(scope=scope, last_page=0, status="completed")
+            self.db.add(checkpoint)
+            self.db.commit()
+        return checkpoint
+    
+    def _save_checkpoint(self, checkpoint: SyncCheckpoint, **values):
+        """동기화 체크포인트 저장"""
+        for field, value in values.items():
+            setattr(checkpoint, field, value)
+        self.db.commit()
+    
     def _clean_store_data(self, data: Dict) -> Dict:
         """API 데이터 정제"""
         cleaned = {}
@@ -99,76 +501,167 @@ class StoreDataService:
     
     # 새로운 API 엔드포인트 지원 메서드들
     
-    def get_stores_by_dong(self, div_id: str, start_index: int = 1, end_index: int = 5) -> List[Dict]:
+    def get_stores_by_dong(self, div_id: str, start_index: int = 1, end_index: int = 5,
+                           cursor: str = None, fields: List[str] = None) -> List[Dict]:
         """행정동 단위 상가업소 조회"""
-        query = self.db.query(Store).filter(Store.adongCd == div_id)
-        stores = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [self._store_to_dict(store) for store in stores]
+        query, to_dict = self._store_query(fields)
+        query = query.filter(Store.adongCd == div_id)
+        rows = self._page(query, [Store.id], start_index, end_index, cursor, count_key=("dong", div_id))
+        return [to_dict(row) for row in rows]
     
-    def get_store_by_bizes_id(self, bizes_id: str) -> Optional[Dict]:
+    def get_store_by_bizes_id(self, bizes_id: str, fields: List[str] = None) -> Optional[Dict]:
         """상가업소번호로 단일 상가업소 조회"""
-        store = self.db.query(Store).filter(Store.bizesId == bizes_id).first()
-        return self._store_to_dict(store) if store else None
+        query, to_dict = self._store_query(fields)
+        row = query.filter(Store.bizesId == bizes_id).first()
+        return to_dict(row) if row else None
+    
+    def get_stores_by_bizes_ids(self, bizes_ids: List[str], fields: List[str] = None) -> Dict:
+        """상가업소번호 목록 일괄 조회 (요청 순서 유지, 없는 번호는 missing으로 반환)"""
+        if len(bizes_ids) > STORE_BATCH_MAX:
+            raise ValueError(f"한 번에 조회할 수 있는 상가업소번호는 최대 {STORE_BATCH_MAX}개입니다.")
+        
+        query, to_dict = self._store_query(fields)
+        query = query.add_columns(Store.bizesId)
+        unique_ids = list(dict.fromkeys(bizes_ids))
+        found = {}
+        for start in range(0, len(unique_ids), STORE_BATCH_CHUNK_SIZE):
+            chunk = unique_ids[start:start + STORE_BATCH_CHUNK_SIZE]
+            for row in query.filter(Store.bizesId.in_(chunk)):
+                found[row[-1]] = to_dict(row)
+        
+        self._set_total_count(sum(1 for bizes_id in bizes_ids if bizes_id in found))
+        return {
+            "row": [found[bizes_id] for bizes_id in bizes_ids if bizes_id in found],
+            "missing": [bizes_id for bizes_id in bizes_ids if bizes_id not in found]
+        }
     
-    def get_stores_by_building(self, key_value: str, start_index: int = 1, end_index: int = 5) -> List[Dict]:
+    def get_stores_by_building(self, key_value: str, start_index: int = 1, end_index: int = 5,
+                               cursor: str = None, fields: List[str] = None) -> List[Dict]:
         """건물 단위 상가업소 조회"""
-        query = self.db.query(Store).filter(Store.bldMngNo == key_value)
-        stores = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [self._store_to_dict(store) for store in stores]
+        query, to_dict = self._store_query(fields)
+        query = query.filter(Store.bldMngNo == key_value)
+        rows = self._page(query, [Store.id], start_index, end_index, cursor, count_key=("building", key_value))
+        return [to_dict(row) for row in rows]
     
-    def get_stores_by_pnu(self, key_value: str, start_index: int = 1, end_index: int = 5) -> List[Dict]:
+    def get_stores_by_pnu(self, key_value: str, start_index: int = 1, end_index: int = 5,
+                          cursor: str = None, fields: List[str] = None) -> List[Dict]:
         """지번 단위 상가업소 조회"""
-        query = self.db.query(Store).filter(Store.lnoAdr.like(f"%{key_value}%"))
-        stores = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [self._store_to_dict(store) for store in stores]
+        query, to_dict = self._store_query(fields)
+        query = query.filter(Store.lnoAdr.like(f"%{key_value}%"))
+        rows = self._page(query, [Store.id], start_index, end_index, cursor, count_key=("pnu", key_value))
+        return [to_dict(row) for row in rows]
     
-    def get_stores_by_area(self, trar_no: str, start_index: int = 1, end_index: int = 5) -> List[Dict]:
+    def get_stores_by_area(self, trar_no: str, start_index: int = 1, end_index: int = 5,
+                           cursor: str = None, fields: List[str] = None) -> List[Dict]:
         """상권 내 상가업소 조회"""
         # 상권번호는 추가 테이블이 필요하지만, 임시로 동일 지역 기준으로 조회
-        query = self.db.query(Store).filter(Store.sggCd == trar_no[:5])
-        stores = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [self._store_to_dict(store) for store in stores]
-    
-    def get_stores_by_radius(self, cx: float, cy: float, radius: int, start_index: int = 1, end_index: int = 5) -> List[Dict]:
-        """반경 내 상가업소 조회"""
-        # 간단한 사각형 범위로 근사
-        lat_range = radius / 111000  # 위도 1도 ≈ 111km
-        lon_range = radius / (111000 * func.cos(func.radians(cy)))
-        
-        query = self.db.query(Store).filter(
-            and_(
-                Store.lat.between(cy - lat_range, cy + lat_range),
-                Store.lon.between(cx - lon_range, cx + lon_range)
-            )
-        )
-        stores = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [self._store_to_dict(store) for store in stores]
+        query, to_dict = self._store_query(fields)
+        query = query.filter(Store.sggCd == trar_no[:5])
+        rows = self._page(query, [Store.id], start_index, end_index, cursor, count_key=("area", trar_no[:5]))
+        return [to_dict(row) for row in rows]
+    
+    def get_stores_by_radius(self, cx: float, cy: float, radius: int, start_index: int = 1, end_index: int = 5,
+                             sort: str = None, limit: int = None, cursor: str = None,
+                             fields: List[str] = None) -> List[Dict]:
+        """반경 내 상가업소 조회
+
+        geohash 인덱스로 사각형 후보(id, 좌표)만 읽은 뒤 대원거리로 반경 밖 후보를 제거한다.
+        sort="distance"이면 가까운 순으로 정렬하고, limit이 있으면 상위 limit개 안에서 페이지를 자른다.
+        """
+        if sort not in (None, "distance"):
+            raise ValueError(f"지원하지 않는 정렬 기준입니다: {sort}")
+        
+        ids, distances = self._radius_candidates(cx, cy, radius)
+        order = np.lexsort((ids, distances)) if sort == "distance" else np.argsort(ids)
+        if limit:
+            order = order[:limit]
+        ids, distances = ids[order], distances[order]
+        self._set_total_count(len(ids))
+        
+        page = self._array_page(ids, distances if sort == "distance" else None,
+                                start_index, end_index, cursor)
+        return self._stores_with_distance(ids[page], distances[page], fields)
+    
+    def get_nearest_stores(self, cx: float, cy: float, k: int = 10, max_radius: int = 20000,
+                           initial_radius: int = 500, fields: List[str] = None) -> List[Dict]:
+        """가장 가까운 상가업소 k개 조회 (반경을 두 배씩 늘려가며 k개 이상 찾으면 중단)"""
+        radius = min(initial_radius, max_radius)
+        while True:
+            ids, distances = self._radius_candidates(cx, cy, radius)
+            if len(ids) >= k or radius >= max_radius:
+                break
+            radius = min(radius * 2, max_radius)
+        
+        # 반경 안의 거리는 정확하므로 반경 내 k개 이상이면 상위 k개가 최근접 결과
+        nearest = np.lexsort((ids, distances))[:k]
+        self._set_total_count(len(nearest))
+        return self._stores_with_distance(ids[nearest], distances[nearest], fields)
+    
+    def _radius_candidates(self, cx: float, cy: float, radius: float):
+        """반경 내 상가 id와 거리(m) 배열"""
+        ids, lons, lats = self._bbox_candidates(*radius_bbox(cx, cy, radius))
+        distances = haversine_distances(cx, cy, lons, lats)
+        mask = distances <= radius
+        return ids[mask], distances[mask]
+    
+    def _bbox_candidates(self, minx: float, miny: float, maxx: float, maxy: float):
+        """사각형 내 상가 후보의 id, 경도, 위도 배열 (geohash 인덱스만으로 조회)"""
+        rows = self.db.query(Store.id, Store.lon, Store.lat).filter(
+            bbox_filter(minx, miny, maxx, maxy)
+        ).all()
+        ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        lons = np.fromiter((r[1] for r in rows), dtype=float, count=len(rows))
+        lats = np.fromiter((r[2] for r in rows), dtype=float, count=len(rows))
+        return ids, lons, lats
+    
+    def _stores_by_ids(self, ids: np.ndarray, fields: List[str] = None) -> Dict[int, Dict]:
+        """id별 상가 정보"""
+        query, to_dict = self._store_query(fields)
+        return {row.id: to_dict(row) for row in query.filter(Store.id.in_(ids.tolist()))}
     
-    def get_stores_by_rectangle(self, minx: float, miny: float, maxx: float, maxy: float, start_index: int = 1, end_index: int = 5) -> List[Dict]:
+    def _stores_in_order(self, ids: np.ndarray, fields: List[str] = None) -> List[Dict]:
+        """id 순서를 유지하여 상가 조회"""
+        stores = self._stores_by_ids(ids, fields)
+        return [stores[store_id] for store_id in ids.tolist() if store_id in stores]
+    
+    def _stores_with_distance(self, ids: np.ndarray, distances: np.ndarray, fields: List[str] = None) -> List[Dict]:
+        """id 순서대로 상가 정보에 거리(m) 추가"""
+        stores = self._stores_by_ids(ids, fields)
+        result = []
+        for store_id, distance in zip(ids.tolist(), distances.tolist()):
+            row = stores.get(store_id)
+            if row is not None:
+                row["distance"] = round(distance, 1)
+                result.append(row)
+        return result
+    
+    def get_stores_by_rectangle(self, minx: float, miny: float, maxx: float, maxy: float, start_index: int = 1,
+                                end_index: int = 5, cursor: str = None, fields: List[str] = None) -> List[Dict]:
         """사각형 내 상가업소 조회"""
-        query = self.db.query(Store).filter(
-            and_(
-                Store.lat.between(miny, maxy),
-                Store.lon.between(minx, maxx)
-            )
-        )
-        stores = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [self._store_to_dict(store) for store in stores]
+        query, to_dict = self._store_query(fields)
+        query = query.filter(bbox_filter(minx, miny, maxx, maxy))
+        rows = self._page(query, [Store.id], start_index, end_index, cursor,
+                          count_key=("rectangle", minx, miny, maxx, maxy))
+        return [to_dict(row) for row in rows]
     
-    def get_stores_by_polygon(self, coordinates: str, start_index: int = 1, end_index: int = 5) -> List[Dict]:
-        """다각형 내 상가업소 조회"""
-        # 간단한 구현: 좌표에서 min/max 추출하여 사각형으로 근사
-        try:
-            coords = [float(x) for x in coordinates.split(',')]
-            lons = coords[::2]
-            lats = coords[1::2]
-            minx, maxx = min(lons), max(lons)
-            miny, maxy = min(lats), max(lats)
-            return self.get_stores_by_rectangle(minx, miny, maxx, maxy, start_index, end_index)
-        except:
-            return []
+    def get_stores_by_polygon(self, coordinates: str, start_index: int = 1, end_index: int = 5,
+                              cursor: str = None, fields: List[str] = None) -> List[Dict]:
+        """다각형 내 상가업소 조회
+
+        다각형 외접 사각형으로 후보(id, 좌표)를 조회한 뒤 ray casting으로 실제 포함 여부를 판정한다.
+        멀티폴리곤과 구멍(hole)을 지원한다.
+        """
+        polygon = prepare_polygon(coordinates)
+        ids, lons, lats = self._bbox_candidates(*polygon.bbox)
+        inside_ids = np.sort(ids[polygon.contains(lons, lats)])
+        self._set_total_count(len(inside_ids))
+        
+        page = self._array_page(inside_ids, None, start_index, end_index, cursor)
+        return self._stores_in_order(inside_ids[page], fields)
     
-    def get_stores_by_upjong(self, inds_lcls_cd: str, inds_mcls_cd: str = None, inds_scls_cd: str = None, start_index: int = 1, end_index: int = 5) -> List[Dict]:
+    def get_stores_by_upjong(self, inds_lcls_cd: str, inds_mcls_cd: str = None, inds_scls_cd: str = None,
+                             start_index: int = 1, end_index: int = 5, cursor: str = None,
+                             fields: List[str] = None) -> List[Dict]:
         """업종별 상가업소 조회"""
         filters = [Store.indsLclsCd == inds_lcls_cd]
         
@@ -177,91 +670,342 @@ class StoreDataService:
         if inds_scls_cd:
             filters.append(Store.indsSclsCd == inds_scls_cd)
         
-        query = self.db.query(Store).filter(and_(*filters))
-        stores = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [self._store_to_dict(store) for store in stores]
-    
-    def get_stores_by_date(self, modified_time: str, start_index: int = 1, end_index: int = 5) -> List[Dict]:
-        """수정일자별 상가업소 조회"""
-        # 날짜 필터링은 created_at 또는 updated_at 필드 기준
-        # 여기서는 모든 데이터를 반환하는 것으로 구현
-        query = self.db.query(Store)
-        stores = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [self._store_to_dict(store) for store in stores]
-    
-    def get_store_modify_info(self, bizes_id: str, start_index: int = 1, end_index: int = 5) -> List[Dict]:
-        """상가업소 변화정보 조회"""
-        # 변화정보는 별도 테이블이 필요하지만, 임시로 해당 상가 정보 반환
-        store = self.db.query(Store).filter(Store.bizesId == bizes_id).first()
-        if store:
-            return [self._store_to_dict(store)]
-        return []
-    
-    def get_large_upjong_list(self, start_index: int = 1, end_index: int = 5) -> List[Dict]:
-        """상권정보 업종 대분류 조회"""
-        query = self.db.query(Store.indsLclsCd, Store.indsLclsNm).distinct()
-        results = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [{"indsLclsCd": r[0], "indsLclsNm": r[1]} for r in results if r[0]]
-    
-    def get_middle_upjong_list(self, inds_lcls_cd: str, start_index: int = 1, end_index: int = 5) -> List[Dict]:
-        """상권정보 업종 중분류 조회"""
-        query = self.db.query(Store.indsMclsCd, Store.indsMclsNm).filter(
-            Store.indsLclsCd == inds_lcls_cd
-        ).distinct()
-        results = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [{"indsMclsCd": r[0], "indsMclsNm": r[1]} for r in results if r[0]]
-    
-    def get_small_upjong_list(self, inds_lcls_cd: str, inds_mcls_cd: str, start_index: int = 1, end_index: int = 5) -> List[Dict]:
-        """상권정보 업종 소분류 조회"""
-        query = self.db.query(Store.indsSclsCd, Store.indsSclsNm).filter(
-            and_(
-                Store.indsLclsCd == inds_lcls_cd,
-                Store.indsMclsCd == inds_mcls_cd
+        query, to_dict = self._store_query(fields)
+        query = query.filter(and_(*filters))
+        rows = self._page(query, [Store.id], start_index, end_index, cursor,
+                          count_key=("upjong", inds_lcls_cd, inds_mcls_cd or None, inds_scls_cd or None))
+        return [to_dict(row) for row in rows]
+    
+    def get_stores_by_date(self, modified_time: str, start_index: int = 1, end_index: int = 5,
+                           cursor: str = None, fields: List[str] = None) -> List[Dict]:
+        """수정일자별 상가업소 조회 (수정일자 이후 생성/변경된 상가)"""
+        since = self._parse_modified_time(modified_time)
+        query, to_dict = self._store_query(fields)
+        query = query.filter(
+            or_(
+                Store.updated_at >= since,
+                and_(Store.updated_at.is_(None), Store.created_at >= since)
             )
-        ).distinct()
-        results = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [{"indsSclsCd": r[0], "indsSclsNm": r[1]} for r in results if r[0]]
+        )
+        rows = self._page(query, [Store.id], start_index, end_index, cursor, count_key=("date", since))
+        return [to_dict(row) for row in rows]
+    
+    def _parse_modified_time(self, modified_time: str) -> datetime:
+        """수정일자 파싱 (YYYYMMDD 또는 YYYY-MM-DD)"""
+        for fmt in ("%Y%m%d", "%Y-%m-%d"):
+            try:
+                return datetime.strptime(modified_time.strip(), fmt)
+            except ValueError:
+                continue
+        raise ValueError(f"수정일자 형식이 올바르지 않습니다 (YYYYMMDD): {modified_time}")
+    
+    def get_store_modify_info(self, bizes_id: str, start_index: int = 1, end_index: int = 5,
+                              cursor: str = None) -> List[Dict]:
+        """상가업소 변화정보 조회 (변경 이력, 최신순)"""
+        query = self.db.query(StoreChange).filter(StoreChange.bizesId == bizes_id)
+        changes = self._page(query, [StoreChange.changed_at, StoreChange.id], start_index, end_index,
+                             cursor, descending=True, count_key=("modify", bizes_id))
+        return [
+            {
+                "bizesId": change.bizesId,
+                "field": change.field,
+                "oldValue": change.old_value,
+                "newValue": change.new_value,
+                "changedAt": change.changed_at.isoformat() if change.changed_at else None
+            }
+            for change in changes
+        ]
     
-    def get_store_zone_in_rectangle(self, minx: float, miny: float, maxx: float, maxy: float, start_index: int = 1, end_index: int = 5) -> List[Dict]:
-        """상권 영역정보 사각형좌표 조회"""
+    def get_large_upjong_list(self, start_index: int = 1, end_index: int = 5, cursor: str = None) -> List[Dict]:
+        """상권정보 업종 대분류 조회 (메모리 업종 트리)"""
+        nodes = self._node_page(upjong_hierarchy.large(self.db), start_index, end_index, cursor)
+        return [{"indsLclsCd": n.code, "indsLclsNm": n.name, "storeCount": n.count} for n in nodes]
+    
+    def get_middle_upjong_list(self, inds_lcls_cd: str, start_index: int = 1, end_index: int = 5,
+                               cursor: str = None) -> List[Dict]:
+        """상권정보 업종 중분류 조회 (메모리 업종 트리)"""
+        nodes = self._node_page(upjong_hierarchy.middle(self.db, inds_lcls_cd), start_index, end_index, cursor)
+        return [{"indsMclsCd": n.code, "indsMclsNm": n.name, "storeCount": n.count} for n in nodes]
+    
+    def get_small_upjong_list(self, inds_lcls_cd: str, inds_mcls_cd: str, start_index: int = 1, end_index: int = 5,
+                              cursor: str = None) -> List[Dict]:
+        """상권정보 업종 소분류 조회 (메모리 업종 트리)"""
+        nodes = self._node_page(
+            upjong_hierarchy.small(self.db, inds_lcls_cd, inds_mcls_cd), start_index, end_index, cursor
+        )
+        return [{"indsSclsCd": n.code, "indsSclsNm": n.name, "storeCount": n.count} for n in nodes]
+    
+    def get_store_zone_in_rectangle(self, minx: float, miny: float, maxx: float, maxy: float, start_index: int = 1,
+                                    end_index: int = 5, cursor: str = None) -> List[Dict]:
+        """상권 영역정보 사각형좌표 조회 (시군구별 상가 수)
+
+        사각형에 완전히 포함되는 geohash 셀은 집계 테이블에서 합산하고,
+        경계에 걸친 셀과 geohash가 아직 없는 상가만 상가 좌표로 직접 센다.
+        시군구코드가 없는 상가(NULL/빈 문자열)는 sggCd가 빈 문자열인 한 그룹으로 합쳐 반환한다.
+        """
         # 상권 영역 정보는 별도 테이블이 필요하지만, 임시로 해당 지역의 상가 집계 정보 반환
-        query = self.db.query(Store.sggCd, Store.sggNm, func.count(Store.id).label('store_count')).filter(
-            and_(
-                Store.lat.between(miny, maxy),
-                Store.lon.between(minx, maxx)
+        inside, boundary = [], []
+        for cell in geohash_cover(minx, miny, maxx, maxy, ZONE_COVER_CELLS, max_precision=6):
+            cell_minx, cell_miny, cell_maxx, cell_maxy = geohash_bbox(cell)
+            contained = minx <= cell_minx and cell_maxx <= maxx and miny <= cell_miny and cell_maxy <= maxy
+            (inside if contained else boundary).append(cell)
+        
+        zones = {}
+        
+        def add(sgg_cd, sgg_nm, count):
+            zone = zones.setdefault(sgg_cd or "", [None, 0])
+            zone[0] = zone[0] or sgg_nm
+            zone[1] += count
+        
+        for row in StoreAggregator(self.db).counts(["sggCd"], geohash_cells=inside):
+            add(row["sggCd"], row["sggNm"], row["storeCount"])
+        
+        in_rectangle = [(Store.lat + 0).between(miny, maxy), (Store.lon + 0).between(minx, maxx)]
+        counted = [Store.geohash.is_(None)]  # 백필 전 상가 (집계 셀에 없음)
+        if boundary:
+            counted.append(geohash_range_filter(Store.geohash, cells_to_ranges(boundary)))
+        rows = self.db.query(Store.sggCd, func.max(Store.sggNm), func.count(Store.id)).filter(
+            or_(*counted), *in_rectangle
+        ).group_by(Store.sggCd)
+        for sgg_cd, sgg_nm, count in rows:
+            add(sgg_cd, sgg_nm, count)
+        
+        result = [
+            {"sggCd": sgg_cd, "sggNm": zones[sgg_cd][0], "storeCount": zones[sgg_cd][1]}
+            for sgg_cd in sorted(zones)
+        ]
+        return self._list_page(result, [(row["sggCd"],) for row in result], start_index, end_index, cursor)
+    
+    def get_store_counts(self, group_by: List[str] = None, filters: Dict[str, str] = None,
+                         limit: int = None) -> List[Dict]:
+        """지역/업종별 상가 수 조회 (집계 테이블 사용)"""
+        result = StoreAggregator(self.db).counts(group_by, {k: v for k, v in (filters or {}).items() if v}, limit=limit)
+        self._set_total_count(len(result))
+        self.next_cursor = None
+        return result
+    
+    def _node_page(self, nodes: List, start_index: int, end_index: int, cursor: str = None) -> List:
+        """코드순 업종 노드 목록의 페이지 (커서는 마지막 코드)"""
+        return self._list_page(nodes, [(node.code,) for node in nodes], start_index, end_index, cursor)
+    
+    def _list_page(self, items: List, keys: List[tuple], start_index: int, end_index: int,
+                   cursor: str = None) -> List:
+        """정렬키(keys) 순으로 정렬된 메모리 목록의 페이지"""
+        size = max(end_index - start_index + 1, 0)
+        if cursor:
+            values = decode_cursor(cursor)
+            if keys and len(values) != len(keys[0]):
+                raise ValueError("커서가 이 목록의 정렬 기준과 맞지 않습니다.")
+            start = bisect_right(keys, tuple(values))
+        else:
+            start = start_index - 1
+        
+        page = items[start:start + size]
+        self._set_total_count(len(items))
+        self.next_cursor = None
+        if page and len(page) == size and start + size < len(items):
+            self.next_cursor = encode_cursor(list(keys[start + size - 1]))
+        return page
+    
+    def _page(self, query, sort_columns: List, start_index: int, end_index: int,
+              cursor: str = None, descending: bool = False, count_key: tuple = None) -> List:
+        """페이지 조회
+
+        cursor가 있으면 커서에 담긴 마지막 정렬키 다음부터(keyset) 읽고,
+        없으면 start_index 기반 offset으로 읽는다. 페이지 크기는 end_index - start_index + 1.
+        다음 페이지 커서는 self.next_cursor, 전체 건수는 self.total_count에 기록한다.
+        """
+        if count_key is not None:
+            self._count(count_key, query)
+        
+        size = max(end_index - start_index + 1, 0)
+        query = query.order_by(*[column.desc() if descending else column for column in sort_columns])
+        if cursor:
+            query = query.filter(self._keyset_filter(sort_columns, decode_cursor(cursor), descending))
+        elif start_index > 1:
+            query = query.offset(start_index - 1)
+        
+        rows = query.limit(size).all()
+        self.next_cursor = None
+        if rows and len(rows) == size:
+            last = rows[-1]
+            self.next_cursor = encode_cursor([
+                self._to_cursor_value(getattr(last, column.key)) for column in sort_columns
+            ])
+        return rows
+    
+    def _count(self, count_key: tuple, query):
+        """목록 전체 건수 (필터 조합별 캐시 -> 정확한 COUNT -> 실행계획 추정치 순)"""
+        cached = count_cache.get(count_key)
+        if cached is None:
+            cached = self._exact_or_estimated_count(query.order_by(None))
+            count_cache.set(count_key, *cached)
+        self._set_total_count(*cached)
+    
+    def _set_total_count(self, count: int, estimated: bool = False):
+        """전체 건수 기록"""
+        self.total_count = count
+        self.total_count_estimated = estimated
+    
+    def _exact_or_estimated_count(self, query):
+        """(건수, 추정치 여부)
+
+        MariaDB는 max_statement_time으로 COUNT 실행 시간을 제한하고,
+        시간을 넘기면 EXPLAIN의 예상 행 수를 추정치로 사용한다.
+        MySQL/SQLite/PostgreSQL 등 다른 DB는 시간 제한과 추정 없이 항상 정확한 COUNT를 실행한다.
+        """
+        dialect = self.db.get_bind().dialect
+        if not getattr(dialect, "is_mariadb", False) or COUNT_TIMEOUT <= 0:
+            return query.count(), False
+        
+        self.db.execute(text("SET SESSION max_statement_time = :seconds"), {"seconds": COUNT_TIMEOUT})
+        try:
+            return query.count(), False
+        except OperationalError as e:
+            logger.warning(f"COUNT 시간 초과, 추정치 사용: {e}")
+        finally:
+            self.db.execute(text("SET SESSION max_statement_time = DEFAULT"))
+        
+        try:
+            sql = query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+            plan = self.db.execute(text(f"EXPLAIN {sql}")).mappings().first()
+            rows = int(plan["rows"] or 0) if plan else 0
+            filtered = float(plan.get("filtered") or 100) if plan else 100
+            return int(rows * filtered / 100), True
+        except Exception as e:
+            # 추정 실패시 시간 제한 없이 정확한 건수 조회
+            logger.warning(f"COUNT 추정 실패: {e}")
+            return query.count(), False
+    
+    def _keyset_filter(self, sort_columns: List, values: List, descending: bool = False):
+        """(c1, c2, ...) > (v1, v2, ...) 사전순 비교 조건 (인덱스 범위 탐색이 가능하도록 OR 전개)"""
+        if len(values) != len(sort_columns):
+            raise ValueError("커서가 이 목록의 정렬 기준과 맞지 않습니다.")
+        
+        values = [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) and value is not None else value
+            for column, value in zip(sort_columns, values)
+        ]
+        terms = []
+        for i, column in enumerate(sort_columns):
+            comparison = column < values[i] if descending else column > values[i]
+            terms.append(and_(*[sort_columns[j] == values[j] for j in range(i)], comparison))
+        return or_(*terms)
+    
+    def _to_cursor_value(self, value):
+        """커서에 담을 수 있는 값으로 변환"""
+        return value.isoformat() if isinstance(value, datetime) else value
+    
+    def _array_page(self, ids: np.ndarray, keys: Optional[np.ndarray], start_index: int, end_index: int,
+                    cursor: str = None) -> np.ndarray:
+        """(정렬키, id) 순으로 정렬된 배열의 페이지 위치 (keys가 None이면 id 순)"""
+        size = max(end_index - start_index + 1, 0)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != (1 if keys is None else 2):
+                raise ValueError("커서가 이 목록의 정렬 기준과 맞지 않습니다.")
+            if keys is None:
+                after = ids > values[0]
+            else:
+                after = (keys > values[0]) | ((keys == values[0]) & (ids > values[1]))
+            positions = np.flatnonzero(after)[:size]
+        else:
+            positions = np.arange(start_index - 1, min(end_index, len(ids)))
+        
+        self.next_cursor = None
+        if len(positions) and len(positions) == size and positions[-1] < len(ids) - 1:
+            last = positions[-1]
+            self.next_cursor = encode_cursor(
+                [int(ids[last])] if keys is None else [float(keys[last]), int(ids[last])]
             )
-        ).group_by(Store.sggCd, Store.sggNm)
-        results = query.offset(start_index - 1).limit(end_index - start_index + 1).all()
-        return [{"sggCd": r[0], "sggNm": r[1], "storeCount": r[2]} for r in results]
+        return positions
     
-    def _store_to_dict(self, store: Store) -> Dict:
-        """Store 객체를 딕셔너리로 변환"""
-        if not store:
-            return {}
+    def _store_query(self, fields: List[str] = None):
+        """필요한 컬럼만 튜플로 읽는 상가 쿼리와 행 변환 함수
+
+        ORM 객체를 만들지 않고 (fields..., id) 행을 바로 딕셔너리로 바꾼다.
+        마지막 id 컬럼은 페이지 커서와 id 순서 유지에만 쓰인다.
+        """
+        names = tuple(parse_store_fields(fields))
+        query = self.db.query(*[getattr(Store, name) for name in names], Store.id)
+        return query, store_row_mapper(names)
+
+class AsyncStoreDataService:
+    """비동기 세션용 상가 조회 서비스
+
+    조회 로직은 StoreDataService를 그대로 사용하고 AsyncSession.run_sync로 실행한다.
+    run_sync 안의 DB 입출력은 비동기 드라이버를 통해 이벤트 루프에 양보하므로
+    느린 쿼리가 같은 워커의 다른 요청을 막지 않는다.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.next_cursor = None
+        self.total_count = 0
+        self.total_count_estimated = False
+    
+    async def _run(self, method_name: str, *args, **kwargs):
+        """동기 서비스 메서드를 비동기 세션에서 실행하고 페이지 정보 복사"""
+        def call(session: Session):
+            service = StoreDataService(session)
+            return getattr(service, method_name)(*args, **kwargs), service
         
-        return {
-            "bizesId": store.bizesId,
-            "bizesNm": store.bizesNm,
-            "brtcNm": store.brtcNm,
-            "sggNm": store.sggNm,
-            "adongNm": store.adongNm,
-            "bdongNm": store.bdongNm,
-            "lnoAdr": store.lnoAdr,
-            "rdnmAdr": store.rdnmAdr,
-            "lon": store.lon,
-            "lat": store.lat,
-            "indsLclsCd": store.indsLclsCd,
-            "indsLclsNm": store.indsLclsNm,
-            "indsMclsCd": store.indsMclsCd,
-            "indsMclsNm": store.indsMclsNm,
-            "indsSclsCd": store.indsSclsCd,
-            "indsSclsNm": store.indsSclsNm,
-            "bldMngNo": store.bldMngNo,
-            "bldNm": store.bldNm,
-            "flrInfo": store.flrInfo,
-            "tel": store.tel,
-            "ctprvnCd": store.ctprvnCd,
-            "sggCd": store.sggCd,
-            "adongCd": store.adongCd,
-            "bdongCd": store.bdongCd
-        }
\ No newline at end of file
+        result, service = await self.db.run_sync(call)
+        self.next_cursor = service.next_cursor
+        self.total_count = service.total_count
+        self.total_count_estimated = service.total_count_estimated
+        return result
+    
+    async def get_stores_by_dong(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_stores_by_dong", *args, **kwargs)
+    
+    async def get_store_by_bizes_id(self, *args, **kwargs) -> Optional[Dict]:
+        return await self._run("get_store_by_bizes_id", *args, **kwargs)
+    
+    async def get_stores_by_bizes_ids(self, *args, **kwargs) -> Dict:
+        return await self._run("get_stores_by_bizes_ids", *args, **kwargs)
+    
+    async def get_stores_by_building(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_stores_by_building", *args, **kwargs)
+    
+    async def get_stores_by_pnu(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_stores_by_pnu", *args, **kwargs)
+    
+    async def get_stores_by_area(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_stores_by_area", *args, **kwargs)
+    
+    async def get_stores_by_radius(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_stores_by_radius", *args, **kwargs)
+    
+    async def get_nearest_stores(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_nearest_stores", *args, **kwargs)
+    
+    async def get_stores_by_rectangle(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_stores_by_rectangle", *args, **kwargs)
+    
+    async def get_stores_by_polygon(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_stores_by_polygon", *args, **kwargs)
+    
+    async def get_stores_by_upjong(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_stores_by_upjong", *args, **kwargs)
+    
+    async def get_stores_by_date(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_stores_by_date", *args, **kwargs)
+    
+    async def get_store_modify_info(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_store_modify_info", *args, **kwargs)
+    
+    async def get_large_upjong_list(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_large_upjong_list", *args, **kwargs)
+    
+    async def get_middle_upjong_list(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_middle_upjong_list", *args, **kwargs)
+    
+    async def get_small_upjong_list(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_small_upjong_list", *args, **kwargs)
+    
+    async def get_store_zone_in_rectangle(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_store_zone_in_rectangle", *args, **kwargs)
+    
+    async def get_store_counts(self, *args, **kwargs) -> List[Dict]:
+        return await self._run("get_store_counts", *args, **kwargs)
@@ -0,0 +1,177 @@
+import io
+import csv
+import sys
+import json
+import logging
+import argparse
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select, and_
+
+from database import engine
+from models import Store
+from data_service import bbox_filter, parse_store_fields
+
+try:
+    import pyarrow as pa  # Parquet 내보내기 (선택사항)
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# 서버측 커서에서 한 번에 가져오는 행 수 (내보내기 청크 크기)
+EXPORT_BATCH_SIZE = 5000
+
+# 내보내기 형식별 MIME 타입
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# 필터로 사용할 수 있는 코드 컬럼
+EXPORT_FILTER_FIELDS = ["ctprvnCd", "sggCd", "adongCd", "indsLclsCd", "indsMclsCd", "indsSclsCd"]
+
+def parse_bbox(bbox: Optional[str]) -> Optional[Sequence[float]]:
+    """'minx,miny,maxx,maxy' 형식 사각형 파싱"""
+    if not bbox:
+        return None
+    try:
+        values = [float(value) for value in bbox.split(",")]
+    except ValueError:
+        values = []
+    if len(values) != 4:
+        raise ValueError("bbox는 minx,miny,maxx,maxy 형식이어야 합니다.")
+    return values
+
+def build_export_query(fields: List[str], filters: Dict[str, str] = None, bbox: Sequence[float] = None):
+    """내보내기 조회 구문 (필요한 컬럼만, id 순)"""
+    conditions = [
+        getattr(Store, field) == value
+        for field, value in (filters or {}).items() if field in EXPORT_FILTER_FIELDS and value
+    ]
+    if bbox:
+        conditions.append(bbox_filter(*bbox))
+    stmt = select(*[getattr(Store, field) for field in fields]).order_by(Store.id)
+    return stmt.where(and_(*conditions)) if conditions else stmt
+
+def iter_row_batches(stmt, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+    """서버측 커서로 행을 batch_size 단위로 반환 (전체 결과를 메모리에 올리지 않음)"""
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=batch_size).execute(stmt)
+        for rows in result.partitions(batch_size):
+            yield rows
+
+def iter_ndjson(fields: List[str], batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    """NDJSON 청크 (배치당 한 번 반환)"""
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n" for row in rows
+        ).encode("utf-8")
+
+def iter_csv(fields: List[str], batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    """CSV 청크 (첫 청크에 헤더 포함)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+class _ChunkSink(io.RawIOBase):
+    """Parquet writer가 쓴 바이트를 모아 두었다가 청크로 넘기는 버퍼"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def iter_parquet(fields: List[str], batches: Iterator[List[tuple]]) -> Iterator[bytes]:
+    """Parquet 청크 (배치마다 row group 하나, 마지막 청크에 footer)"""
+    if pa is None:
+        raise ValueError("Parquet 내보내기에는 pyarrow 패키지가 필요합니다.")
+
+    schema = pa.schema([
+        (field, pa.float64() if field in ("lon", "lat") else pa.string()) for field in fields
+    ])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for rows in batches:
+            columns = list(zip(*rows)) if rows else [[] for _ in fields]
+            writer.write_table(pa.table(
+                [pa.array(column, type=schema.field(i).type) for i, column in enumerate(columns)],
+                schema=schema
+            ))
+            yield sink.drain()
+    yield sink.drain()
+
+# 형식별 청크 생성기
+EXPORT_WRITERS = {
+    "ndjson": iter_ndjson,
+    "csv": iter_csv,
+    "parquet": iter_parquet,
+}
+
+def export_stores(fmt: str, fields: List[str], filters: Dict[str, str] = None,
+                  bbox: Sequence[float] = None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """조건에 맞는 상가를 지정 형식의 바이트 청크로 반환"""
+    if fmt not in EXPORT_WRITERS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt}")
+    if fmt == "parquet" and pa is None:
+        raise ValueError("Parquet 내보내기에는 pyarrow 패키지가 필요합니다.")
+    stmt = build_export_query(fields, filters, bbox)
+    return EXPORT_WRITERS[fmt](fields, iter_row_batches(stmt, batch_size))
+
+def main():
+    """상가 데이터 내보내기
+
+    사용법: python exporter.py --format csv --output stores.csv [--ctprvnCd 11] [--bbox minx,miny,maxx,maxy]
+    """
+    parser = argparse.ArgumentParser(description="상가 데이터 스트리밍 내보내기")
+    parser.add_argument("--format", choices=list(EXPORT_WRITERS), default="ndjson")
+    parser.add_argument("--output", default="-", help="출력 파일 (기본: 표준출력)")
+    parser.add_argument("--fields", help="쉼표로 구분된 컬럼 목록")
+    parser.add_argument("--bbox", help="minx,miny,maxx,maxy")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    for field in EXPORT_FILTER_FIELDS:
+        parser.add_argument(f"--{field}")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    filters = {field: getattr(args, field) for field in EXPORT_FILTER_FIELDS}
+    chunks = export_stores(args.format, parse_store_fields(args.fields), filters, parse_bbox(args.bbox), args.batch_size)
+
+    output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        total = 0
+        for chunk in chunks:
+            output.write(chunk)
+            total += len(chunk)
+        logger.info(f"내보내기 완료: {total:,} bytes")
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+if __name__ == "__main__":
+    main()
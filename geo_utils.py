@@ -0,0 +1,240 @@
+import re
+import math
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# 지구 평균 반지름 (m)
+EARTH_RADIUS_M = 6371008.8
+
+# geohash base32 문자 (오름차순 정렬 상태)
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# 저장용 geohash 정밀도 (약 3.7cm x 1.9cm)
+GEOHASH_PRECISION = 12
+
+# 범위 조회시 최대 정밀도 (약 38m x 19m)
+MAX_COVER_PRECISION = 8
+
+# 범위 조회시 최대 셀 수 (많을수록 후보가 줄지만 인덱스 구간 탐색 횟수가 늘어남)
+MAX_COVER_CELLS = 64
+
+def encode_geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    """위경도를 geohash 문자열로 변환"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    lat = min(max(lat, -90.0), 90.0)
+    lon = min(max(lon, -180.0), 180.0)
+
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True  # 짝수 비트는 경도, 홀수 비트는 위도
+
+    while len(geohash) < precision:
+        target, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (target[0] + target[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            target[0] = mid
+        else:
+            bits <<= 1
+            target[1] = mid
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """정밀도별 geohash 셀 크기 (위도 폭, 경도 폭)"""
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+def geohash_bbox(geohash: str) -> Tuple[float, float, float, float]:
+    """geohash 셀 범위 (minx, miny, maxx, maxy)"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        bits = GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            target = lon_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            if (bits >> shift) & 1:
+                target[0] = mid
+            else:
+                target[1] = mid
+            even = not even
+    return lon_range[0], lat_range[0], lon_range[1], lat_range[1]
+
+def geohash_cover(minx: float, miny: float, maxx: float, maxy: float,
+                  max_cells: int = MAX_COVER_CELLS, max_precision: int = MAX_COVER_PRECISION) -> List[str]:
+    """사각형 범위를 덮는 geohash 셀 목록 (셀 수가 max_cells 이하인 가장 높은 정밀도)"""
+    width = max(maxx - minx, 0.0)
+    height = max(maxy - miny, 0.0)
+
+    precision = 1
+    for candidate in range(max_precision, 0, -1):
+        cell_lat, cell_lon = geohash_cell_size(candidate)
+        estimated = (math.ceil(height / cell_lat) + 1) * (math.ceil(width / cell_lon) + 1)
+        if estimated <= max_cells:
+            precision = candidate
+            break
+
+    cell_lat, cell_lon = geohash_cell_size(precision)
+    cells = set()
+
+    # 셀 크기 간격의 격자점(+경계점)은 범위와 겹치는 모든 셀을 한 번 이상 지난다
+    lat = miny
+    while True:
+        lon = minx
+        while True:
+            cells.add(encode_geohash(lat, lon, precision))
+            if lon >= maxx:
+                break
+            lon = min(lon + cell_lon, maxx)
+        if lat >= maxy:
+            break
+        lat = min(lat + cell_lat, maxy)
+
+    return sorted(cells)
+
+def next_geohash_prefix(prefix: str) -> Optional[str]:
+    """정렬 순서상 prefix로 시작하는 모든 geohash 바로 다음 값 (상한 없음이면 None)"""
+    chars = list(prefix)
+    while chars:
+        index = GEOHASH_BASE32.index(chars[-1])
+        if index + 1 < len(GEOHASH_BASE32):
+            chars[-1] = GEOHASH_BASE32[index + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
+
+def geohash_ranges(minx: float, miny: float, maxx: float, maxy: float,
+                   max_cells: int = MAX_COVER_CELLS) -> List[Tuple[str, Optional[str]]]:
+    """사각형 범위를 덮는 geohash [하한, 상한) 구간 목록 (인접 셀은 하나의 구간으로 병합)"""
+    return cells_to_ranges(geohash_cover(minx, miny, maxx, maxy, max_cells))
+
+def cells_to_ranges(cells: List[str]) -> List[Tuple[str, Optional[str]]]:
+    """정렬된 geohash 셀 목록을 [하한, 상한) 구간 목록으로 변환 (인접 셀은 병합)"""
+    ranges = []
+    for prefix in cells:
+        upper = next_geohash_prefix(prefix)
+        if ranges and ranges[-1][1] == prefix:
+            ranges[-1] = (ranges[-1][0], upper)
+        else:
+            ranges.append((prefix, upper))
+    return ranges
+
+def radius_bbox(cx: float, cy: float, radius: float) -> Tuple[float, float, float, float]:
+    """중심점(경도 cx, 위도 cy)과 반경(m)을 포함하는 사각형 (minx, miny, maxx, maxy)"""
+    lat_range = math.degrees(radius / EARTH_RADIUS_M)
+    cos_lat = max(math.cos(math.radians(cy)), 1e-6)
+    lon_range = min(lat_range / cos_lat, 180.0)
+    return cx - lon_range, cy - lat_range, cx + lon_range, cy + lat_range
+
+def haversine_distances(cx: float, cy: float, lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+    """중심점에서 각 좌표까지의 대원거리 (m, 벡터 연산)"""
+    lat1 = math.radians(cy)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons) - math.radians(cx)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+class PreparedPolygon:
+    """점 포함 판정용으로 변 좌표를 미리 배열로 만든 (멀티)폴리곤
+
+    각 폴리곤의 외곽선과 구멍을 모두 변 목록에 넣고 even-odd 규칙으로 판정하므로
+    구멍 안의 점은 자동으로 제외된다. 멀티폴리곤은 폴리곤별 판정 결과의 합집합이다.
+    """
+
+    # 점 x 변 교차 계산 행렬 크기 제한용 점 배치 크기
+    BATCH_SIZE = 10000
+
+    def __init__(self, polygons: List[List[np.ndarray]]):
+        if not polygons:
+            raise ValueError("다각형 좌표가 비어 있습니다.")
+
+        self.edges = []
+        for rings in polygons:
+            starts = np.concatenate([ring for ring in rings])
+            ends = np.concatenate([np.roll(ring, -1, axis=0) for ring in rings])
+            self.edges.append((starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1]))
+
+        points = np.concatenate([ring for rings in polygons for ring in rings])
+        self.bbox = (
+            float(points[:, 0].min()), float(points[:, 1].min()),
+            float(points[:, 0].max()), float(points[:, 1].max())
+        )
+
+    def contains(self, lons: np.ndarray, lats: np.ndarray) -> np.ndarray:
+        """각 좌표의 다각형 포함 여부 (벡터화된 ray casting)"""
+        result = np.zeros(len(lons), dtype=bool)
+        for start in range(0, len(lons), self.BATCH_SIZE):
+            px = lons[start:start + self.BATCH_SIZE, None]
+            py = lats[start:start + self.BATCH_SIZE, None]
+            inside = np.zeros(len(px), dtype=bool)
+            for x1, y1, x2, y2 in self.edges:
+                straddles = (y1 > py) != (y2 > py)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    cross_x = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+                crossings = np.count_nonzero(straddles & (px < cross_x), axis=1)
+                inside |= (crossings % 2) == 1
+            result[start:start + self.BATCH_SIZE] = inside
+        return result
+
+def _parse_ring(text: str) -> np.ndarray:
+    """'x y, x y, ...' 형식 링 파싱 (닫는 점 중복은 제거)"""
+    points = [[float(value) for value in point.split()] for point in text.split(",") if point.strip()]
+    ring = np.array(points, dtype=float)
+    if ring.ndim != 2 or ring.shape[1] != 2:
+        raise ValueError("다각형 좌표 형식이 올바르지 않습니다.")
+    if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+        ring = ring[:-1]
+    if len(ring) < 3:
+        raise ValueError("다각형은 최소 3개의 점이 필요합니다.")
+    return ring
+
+def parse_polygon(coordinates: str) -> List[List[np.ndarray]]:
+    """다각형 좌표 파싱 -> [폴리곤[링(경도, 위도 배열)]]
+
+    지원 형식:
+    - "x1,y1,x2,y2,..." (단일 외곽선)
+    - WKT "POLYGON((x y, ...), (구멍))"
+    - WKT "MULTIPOLYGON(((x y, ...)), ((x y, ...), (구멍)))"
+    """
+    text = coordinates.strip()
+    upper = text.upper()
+
+    if upper.startswith("MULTIPOLYGON") or upper.startswith("POLYGON"):
+        body = text[text.index("("):]
+        if upper.startswith("POLYGON"):
+            body = f"({body})"
+        polygons = []
+        # 바깥 괄호를 벗긴 뒤 '((...), (...))' 단위로 폴리곤 분리
+        for polygon_text in re.findall(r"\(\s*(\(.*?\)(?:\s*,\s*\(.*?\))*)\s*\)", body[1:-1]):
+            rings = [_parse_ring(ring_text) for ring_text in re.findall(r"\(([^()]*)\)", polygon_text)]
+            polygons.append(rings)
+        if not polygons:
+            raise ValueError("다각형 좌표 형식이 올바르지 않습니다.")
+        return polygons
+
+    values = [float(value) for value in text.split(",")]
+    if len(values) % 2:
+        raise ValueError("다각형 좌표는 경도,위도 쌍이어야 합니다.")
+    ring = np.array(values, dtype=float).reshape(-1, 2)
+    return [[_parse_ring(", ".join(f"{x} {y}" for x, y in ring))]]
+
+@lru_cache(maxsize=256)
+def prepare_polygon(coordinates: str) -> PreparedPolygon:
+    """다각형 파싱 + 변 배열 준비 (같은 좌표 문자열은 캐시 재사용)"""
+    return PreparedPolygon(parse_polygon(coordinates))
@@ -0,0 +1,246 @@
+import math
+import os
+import sys
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from api_client import StoreAPIClient, REGION_CODES
+
+logger = logging.getLogger(__name__)
+
+# 페이지당 조회 건수 (공공데이터 API 최대값)
+DEFAULT_NUM_OF_ROWS = 1000
+
+# 동시 요청 수 (동일 호스트 대상이므로 워커 수가 곧 호스트별 동시성 한도)
+DEFAULT_MAX_WORKERS = int(os.getenv("HARVEST_MAX_WORKERS", 4))
+
+# DB writer로 전달하는 항목 청크 크기
+DEFAULT_CHUNK_SIZE = int(os.getenv("HARVEST_CHUNK_SIZE", 500))
+
+# API 결과코드 (00: 정상, 03: 데이터 없음)
+SUCCESS_RESULT_CODES = {"00", "0"}
+NO_DATA_RESULT_CODES = {"03"}
+
+class StoreHarvester:
+    """totalCount 기반 전체 페이지 병렬 수집기"""
+
+    def __init__(self, api_client: StoreAPIClient = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                 num_of_rows: int = DEFAULT_NUM_OF_ROWS, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 stream: bool = True):
+        self.api_client = api_client or StoreAPIClient()
+        self.max_workers = max(1, max_workers)
+        self.num_of_rows = num_of_rows
+        self.chunk_size = max(1, chunk_size)
+        self.stream = stream
+
+    def _iter_page_items(self, endpoint: str, params: Dict, page_no: int, meta: Dict) -> Iterator[Dict]:
+        """페이지 항목 반환 (스트리밍 모드는 응답을 점진적으로 파싱)"""
+        if self.stream:
+            yield from self.api_client.iter_page_items(endpoint, params, page_no, self.num_of_rows, meta)
+            return
+
+        page = self.api_client.get_page(endpoint, params, page_no, self.num_of_rows)
+        if page is None:
+            raise RuntimeError("API 응답 없음")
+        meta["totalCount"] = page["totalCount"]
+        if page.get("resultCode") is not None:
+            meta["resultCode"] = page["resultCode"]
+            meta["resultMsg"] = page.get("resultMsg")
+        yield from page["items"]
+
+    @staticmethod
+    def _check_response(meta: Dict):
+        """오류 응답 확인 (인증키 오류, 트래픽 초과 등은 HTTP 200이어도 totalCount가 없음)"""
+        result_code = meta.get("resultCode")
+        if result_code in NO_DATA_RESULT_CODES:
+            meta.setdefault("totalCount", 0)
+            return
+        if result_code is not None and result_code not in SUCCESS_RESULT_CODES:
+            raise RuntimeError(f"API 오류 응답 ({result_code}: {meta.get('resultMsg')})")
+        if "totalCount" not in meta:
+            raise RuntimeError(f"totalCount 없는 응답 ({result_code}: {meta.get('resultMsg')})")
+
+    def _iter_page_chunks(self, endpoint: str, params: Dict, page_no: int,
+                          meta: Dict) -> Iterator[Tuple[int, List[Dict], bool]]:
+        """페이지를 chunk_size 단위로 나누어 (페이지번호, 항목, 페이지 종료 여부)로 반환
+
+        오류 응답이면 페이지 종료를 알리기 전에 RuntimeError를 발생시켜 실패 페이지로 처리되게 한다.
+        """
+        chunk = []
+        for item in self._iter_page_items(endpoint, params, page_no, meta):
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                yield page_no, chunk, False
+                chunk = []
+        self._check_response(meta)
+        yield page_no, chunk, True
+
+    def _put(self, out: queue.Queue, message: Tuple, stop: threading.Event) -> bool:
+        """수집 중단 전까지 결과 큐에 전달 (큐가 가득 차면 대기)"""
+        while not stop.is_set():
+            try:
+                out.put(message, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fetch_page(self, endpoint: str, params: Dict, page_no: int, out: queue.Queue, stop: threading.Event):
+        """워커 스레드에서 단일 페이지 조회"""
+        try:
+            for message in self._iter_page_chunks(endpoint, params, page_no, {}):
+                if not self._put(out, message, stop):
+                    return
+        except Exception as e:
+            logger.error(f"{endpoint} {params} {page_no}페이지 조회 실패: {e}")
+            self._put(out, (page_no, None, True), stop)
+
+    def iter_pages(self, div_id: str, key: str,
+                   start_page: int = 1) -> Iterator[Tuple[int, Optional[List[Dict]], bool]]:
+        """행정구역 단위 상가업소 전체 페이지 조회"""
+        return self._iter_pages("storeListInDong", {"divId": div_id, "key": key}, start_page)
+
+    def iter_modified_pages(self, modified_date: str, ctprvn_cd: str = None,
+                            start_page: int = 1) -> Iterator[Tuple[int, Optional[List[Dict]], bool]]:
+        """수정일자(YYYYMMDD) 기준 변경 상가업소 전체 페이지 조회"""
+        params = {"key": modified_date}
+        if ctprvn_cd:
+            params.update({"divId": "ctprvnCd", "ctprvnCd": ctprvn_cd})
+        return self._iter_pages("storeListByDate", params, start_page)
+
+    def _iter_pages(self, endpoint: str, params: Dict,
+                    start_page: int = 1) -> Iterator[Tuple[int, Optional[List[Dict]], bool]]:
+        """첫 페이지의 totalCount를 읽고 나머지 페이지를 병렬 조회
+
+        (페이지번호, 항목 청크, 페이지 종료 여부)를 도착 순서대로 반환하며,
+        조회에 실패한 페이지는 항목 대신 None을 반환한다.
+        결과 큐 크기를 워커 수의 2배로 제한하여 메모리 사용량을 일정하게 유지한다.
+        """
+        meta = {}
+        try:
+            yield from self._iter_page_chunks(endpoint, params, start_page, meta)
+        except Exception as e:
+            logger.error(f"{endpoint} {params} {start_page}페이지 조회 실패: {e}")
+            yield start_page, None, True
+            return
+
+        total_count = meta["totalCount"]
+        total_pages = math.ceil(total_count / self.num_of_rows)
+        logger.info(f"{endpoint} {params}: 전체 {total_count}건, {total_pages}페이지")
+
+        remaining = total_pages - start_page
+        if remaining <= 0:
+            return
+
+        out = queue.Queue(maxsize=self.max_workers * 2)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            for page_no in range(start_page + 1, total_pages + 1):
+                executor.submit(self._fetch_page, endpoint, params, page_no, out, stop)
+
+            while remaining:
+                message = out.get()
+                if message[2]:
+                    remaining -= 1
+                yield message
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def harvest(self, div_id: str, key: str, writer: Callable[[List[Dict]], Dict],
+                start_page: int = 1, on_progress: Callable[[int], None] = None) -> Dict:
+        """단일 지역 전체 페이지를 수집하여 writer로 전달"""
+        return self._harvest(self.iter_pages(div_id, key, start_page), writer, start_page, on_progress)
+
+    def harvest_modified(self, modified_date: str, writer: Callable[[List[Dict]], Dict],
+                         ctprvn_cd: str = None, start_page: int = 1,
+                         on_progress: Callable[[int], None] = None) -> Dict:
+        """수정일자 기준 변경분 전체 페이지를 수집하여 writer로 전달"""
+        return self._harvest(
+            self.iter_modified_pages(modified_date, ctprvn_cd, start_page), writer, start_page, on_progress
+        )
+
+    def _harvest(self, pages: Iterator[Tuple[int, Optional[List[Dict]], bool]],
+                 writer: Callable[[List[Dict]], Dict], start_page: int = 1,
+                 on_progress: Callable[[int], None] = None) -> Dict:
+        """페이지 스트림을 writer로 전달하고 결과 집계
+
+        on_progress는 start_page부터 연속으로 완료된 마지막 페이지 번호가 바뀔 때마다 호출된다.
+        (페이지가 병렬로 완료되므로 재개 지점은 연속 완료 구간 기준)
+        """
+        result = {
+            "total_processed": 0,
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "errors": 0,
+            "pages": 0,
+            "failed_pages": []
+        }
+        completed = set()
+        last_contiguous = start_page - 1
+
+        for page_no, items, page_done in pages:
+            if items is None:
+                result["failed_pages"].append(page_no)
+                continue
+
+            if items:
+                write_result = writer(items)
+                for field in ("total_processed", "inserted", "updated", "unchanged", "errors"):
+                    result[field] += write_result.get(field, 0)
+
+            if page_done:
+                result["pages"] += 1
+                completed.add(page_no)
+                advanced = False
+                while last_contiguous + 1 in completed:
+                    last_contiguous += 1
+                    completed.discard(last_contiguous)
+                    advanced = True
+                if advanced and on_progress:
+                    on_progress(last_contiguous)
+
+        return result
+
+def main():
+    """전국(또는 지정 시도) 상가 데이터 수집 후 DB 저장
+
+    사용법: python harvester.py [--incremental] [시도코드 ...]
+    """
+    from database import SessionLocal, create_tables
+    from data_service import StoreDataService
+
+    logging.basicConfig(level=logging.INFO)
+    create_tables()
+
+    args = sys.argv[1:]
+    incremental = "--incremental" in args
+
+    # 인자로 시도코드를 지정하면 해당 시도만 수집
+    codes = [arg for arg in args if not arg.startswith("--")]
+    region_codes = {name: code for name, code in REGION_CODES.items() if not codes or code in codes}
+
+    db = SessionLocal()
+    try:
+        service = StoreDataService(db)
+        service.prepare_derived_tables()  # 증분 집계/색인/태깅 전에 기존 상가 반영
+        for region_name, ctprvn_cd in region_codes.items():
+            if incremental:
+                result = service.sync_incremental(ctprvn_cd)
+                print(f"{region_name}: 처리 일자 {list(result['dates'])}, 완료 여부 {result['completed']}")
+                continue
+
+            result = service.sync_region(ctprvn_cd)
+            print(f"{region_name}: 처리 {result['total_processed']}건, 신규 {result['inserted']}건, "
+                  f"갱신 {result['updated']}건, 변경없음 {result['unchanged']}건, 오류 {result['errors']}건, "
+                  f"실패 페이지 {result['failed_pages']}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,22 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict, FrozenSet
+from functools import lru_cache
+import asyncio
 import logging
 import os
 from dotenv import load_dotenv
 
-from database import get_db, create_tables
-from models import StoreResponse
-from data_service import StoreDataService
+from database import get_async_db, create_tables, get_pool_stats, SessionLocal, async_engine
+from models import StoreResponse, StoreBatchRequest
+from data_service import StoreDataService, AsyncStoreDataService, parse_store_fields
+from cache import count_cache, response_cache, read_data_version, invalidate_data_caches, DATA_VERSION_POLL_INTERVAL
+from responses import json_response, add_compression_middleware
+from upjong_hierarchy import upjong_hierarchy
+from aggregates import AGGREGATE_DIMENSIONS
+from exporter import EXPORT_MEDIA_TYPES, export_stores, parse_bbox
 
 # 환경변수 로드
 load_dotenv()
@@ -23,11 +32,111 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# 응답 캐시 대상 조회 API (동기화 전까지 결과가 바뀌지 않음)
+CACHED_ENDPOINTS = {
+    "/storeListInDong", "/storeOne", "/storeListInBuilding", "/storeListInPnu", "/storeListInArea",
+    "/storeListInRadius", "/storeListNearest", "/storeListInRectangle", "/storeListInPolygon",
+    "/storeListInUpjong", "/storeListByDate", "/reqStoreModify", "/largeUpjongList",
+    "/middleUpjongList", "/smallUpjongList", "/storeZoneInRectangle", "/storeStats"
+}
+
+# 캐시 키에서 제외하는 파라미터 (조회 결과에 영향 없음)
+CACHE_IGNORED_PARAMS = {"key"}
+
+@lru_cache(maxsize=None)
+def required_query_params(path: str) -> FrozenSet[str]:
+    """GET 엔드포인트의 필수 쿼리 파라미터 이름"""
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+            return frozenset(field.alias for field in route.dependant.query_params if field.required)
+    return frozenset()
+
+@app.middleware("http")
+async def response_cache_middleware(request: Request, call_next):
+    """조회 API 응답 캐시 + ETag/If-None-Match 처리 (캐시 적중시 DB 세션을 만들지 않음)
+
+    캐시 조회는 요청 검증보다 먼저 일어나므로, 캐시 키에서 빠지는 파라미터(key)를 포함해
+    필수 파라미터가 하나라도 없으면 캐시를 거치지 않고 FastAPI 검증(422)에 맡긴다.
+    필수 파라미터가 모두 있으면 나머지 값 검증 결과는 캐시 키에 포함된 값으로 결정되고,
+    200 응답만 저장하므로 검증에 실패하는 요청은 캐시에서 응답되지 않는다.
+    """
+    if request.method != "GET" or request.url.path not in CACHED_ENDPOINTS:
+        return await call_next(request)
+    if not required_query_params(request.url.path) <= request.query_params.keys():
+        return await call_next(request)
+    
+    params = {name: value for name, value in request.query_params.items() if name not in CACHE_IGNORED_PARAMS}
+    cache_key = response_cache.make_key(request.url.path, params)
+    cached = response_cache.get(cache_key)
+    if cached is None:
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = response_cache.set(cache_key, body)
+        cache_status = "MISS"
+    else:
+        etag, body = cached
+        cache_status = "HIT"
+    
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Cache": cache_status}
+    if_none_match = request.headers.get("if-none-match", "")
+    # If-None-Match는 약한 비교 (W/ 접두사 무시)
+    if etag.removeprefix("W/") in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# 큰 응답 압축 (응답 캐시보다 바깥에 두어 캐시에는 압축 전 본문을 저장)
+add_compression_middleware(app)
+
 # 서버 시작시 테이블 생성
 @app.on_event("startup")
 async def startup_event():
+    # 동기 DB 작업은 이벤트 루프를 막지 않도록 스레드에서 실행
+    # (geohash/집계/상호명 색인/태그 생성은 python setup_mariadb.py 또는 harvester.py에서 실행)
+    await asyncio.to_thread(prepare_worker)
+    app.state.data_version_poller = asyncio.create_task(poll_data_version())
+
+def prepare_worker():
+    """테이블 생성 + 파생 데이터 확인 + 현재 데이터 버전의 업종 분류 트리/캐시 준비"""
     create_tables()
     logger.info("데이터베이스 테이블이 생성되었습니다.")
+    
+    db = SessionLocal()
+    try:
+        for problem in StoreDataService(db).check_derived_tables():
+            logger.error(f"{problem} - python setup_mariadb.py로 파생 데이터를 생성한 뒤 서버를 다시 시작하세요.")
+        version = read_data_version(db)
+        upjong_hierarchy.refresh(db, version)  # 업종 분류 트리 미리 생성
+        invalidate_data_caches(version)
+    finally:
+        db.close()
+
+async def poll_data_version():
+    """공유 데이터 버전 주기 확인 (수집기 등 다른 프로세스의 동기화를 이 워커의 업종 트리/캐시에 반영)"""
+    while True:
+        try:
+            async with async_engine.connect() as conn:
+                version = await conn.run_sync(read_data_version)
+            if version > count_cache.version:
+                await refresh_upjong_hierarchy(version)
+                invalidate_data_caches(version)
+        except Exception as e:
+            logger.warning(f"데이터 버전 확인 실패: {e}")
+        await asyncio.sleep(DATA_VERSION_POLL_INTERVAL)
+
+async def refresh_upjong_hierarchy(version: int):
+    """새 데이터 버전의 업종 분류 트리 생성 (캐시 무효화 전에 만들어 무효화 직후 응답이 이전 트리로 캐시되지 않게 함)"""
+    try:
+        await asyncio.to_thread(upjong_hierarchy.refresh_in_new_session, version)
+    except Exception as e:
+        logger.warning(f"업종 분류 트리 갱신 실패: {e}")
+
+# 서버 종료시 버전 확인 중지 + 비동기 연결 풀 정리
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.data_version_poller.cancel()
+    await async_engine.dispose()
 
 @app.get("/")
 async def root():
@@ -37,22 +146,41 @@ async def root():
 async def health_check():
     return {"status": "healthy", "message": "서비스가 정상 작동 중입니다."}
 
+@app.get("/poolStats")
+async def pool_stats():
+    """DB 연결 풀 통계 (사용 중/초과 연결 수, 연결 대기시간, 새 연결 생성 시간)"""
+    return get_pool_stats()
+
+@app.get("/cacheStats")
+async def cache_stats():
+    """응답 캐시 통계 (버전, 적중/미적중 수, 사용 바이트)"""
+    return response_cache.stats()
+
 # 1. 행정동 단위 상가업소 조회
 @app.get("/storeListInDong")
 async def get_store_list_in_dong(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("storeListInDong", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     divId: str = Query(..., description="행정동코드"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """행정동 단위 상가업소 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_stores_by_dong(divId, start_index, end_index)
-        return {"storeListInDong": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_stores_by_dong(divId, start_index, end_index, cursor=cursor, fields=fields)
+        return json_response({"storeListInDong": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -63,15 +191,38 @@ async def get_store_one(
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("storeOne", description="서비스명"),
     bizesId: str = Query(..., description="상가업소번호"),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """단일 상가업소 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_store_by_bizes_id(bizesId)
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_store_by_bizes_id(bizesId, fields=fields)
         if not result:
             raise HTTPException(status_code=404, detail="상가업소를 찾을 수 없습니다.")
-        return {"storeOne": {"list_total_count": 1, "row": [result]}}
+        return json_response({"storeOne": {"list_total_count": 1, "row": [result]}})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 2-1. 상가업소 일괄 조회
+@app.post("/storeBatch")
+async def get_store_batch(
+    request: StoreBatchRequest,
+    key: str = Query(..., description="인증키"),
+    type: str = Query("json", description="요청파일타입"),
+    service: str = Query("storeBatch", description="서비스명"),
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """상가업소번호 목록 일괄 조회 (요청 순서대로 반환, 없는 번호는 missing)"""
+    try:
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_stores_by_bizes_ids(request.bizesIds, fields=fields)
+        return json_response({"storeBatch": {"list_total_count": service_obj.total_count, **result}})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -81,16 +232,25 @@ async def get_store_list_in_building(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("storeListInBuilding", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     key_value: str = Query(..., description="건물관리번호"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """건물 단위 상가업소 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_stores_by_building(key_value, start_index, end_index)
-        return {"storeListInBuilding": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_stores_by_building(key_value, start_index, end_index, cursor=cursor, fields=fields)
+        return json_response({"storeListInBuilding": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -100,16 +260,25 @@ async def get_store_list_in_pnu(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("storeListInPnu", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     key_value: str = Query(..., description="지번주소"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """지번 단위 상가업소 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_stores_by_pnu(key_value, start_index, end_index)
-        return {"storeListInPnu": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_stores_by_pnu(key_value, start_index, end_index, cursor=cursor, fields=fields)
+        return json_response({"storeListInPnu": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -119,16 +288,25 @@ async def get_store_list_in_area(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("storeListInArea", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     trarNo: str = Query(..., description="상권번호"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """상권 내 상가업소 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_stores_by_area(trarNo, start_index, end_index)
-        return {"storeListInArea": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_stores_by_area(trarNo, start_index, end_index, cursor=cursor, fields=fields)
+        return json_response({"storeListInArea": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -138,18 +316,52 @@ async def get_store_list_in_radius(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("storeListInRadius", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     radius: int = Query(..., description="반경"),
     cx: float = Query(..., description="중심점 X좌표"),
     cy: float = Query(..., description="중심점 Y좌표"),
-    db: Session = Depends(get_db)
+    sort: Optional[str] = Query(None, description="정렬기준 (distance: 거리순)"),
+    limit: Optional[int] = Query(None, ge=1, description="최대 결과 수 (거리순 정렬시 가까운 N개)"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """반경 내 상가업소 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_stores_by_radius(cx, cy, radius, start_index, end_index)
-        return {"storeListInRadius": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_stores_by_radius(cx, cy, radius, start_index, end_index, sort, limit, cursor=cursor, fields=fields)
+        return json_response({"storeListInRadius": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 6-1. 최근접 상가업소 조회
+@app.get("/storeListNearest")
+async def get_store_list_nearest(
+    key: str = Query(..., description="인증키"),
+    type: str = Query("json", description="요청파일타입"),
+    service: str = Query("storeListNearest", description="서비스명"),
+    cx: float = Query(..., description="중심점 X좌표"),
+    cy: float = Query(..., description="중심점 Y좌표"),
+    k: int = Query(10, ge=1, le=1000, description="조회 개수"),
+    maxRadius: int = Query(20000, ge=1, description="최대 탐색 반경"),
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """최근접 상가업소 조회 (거리순)"""
+    try:
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_nearest_stores(cx, cy, k, maxRadius, fields=fields)
+        return json_response({"storeListNearest": {"list_total_count": service_obj.total_count, "row": result}})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -159,19 +371,28 @@ async def get_store_list_in_rectangle(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("storeListInRectangle", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     minx: float = Query(..., description="최소 X좌표"),
     miny: float = Query(..., description="최소 Y좌표"),
     maxx: float = Query(..., description="최대 X좌표"),
     maxy: float = Query(..., description="최대 Y좌표"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """사각형 내 상가업소 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_stores_by_rectangle(minx, miny, maxx, maxy, start_index, end_index)
-        return {"storeListInRectangle": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_stores_by_rectangle(minx, miny, maxx, maxy, start_index, end_index, cursor=cursor, fields=fields)
+        return json_response({"storeListInRectangle": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -181,16 +402,25 @@ async def get_store_list_in_polygon(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("storeListInPolygon", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
-    coordinates: str = Query(..., description="다각형 좌표"),
-    db: Session = Depends(get_db)
+    coordinates: str = Query(..., description="다각형 좌표 (x1,y1,x2,y2,... 또는 WKT POLYGON/MULTIPOLYGON)"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """다각형 내 상가업소 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_stores_by_polygon(coordinates, start_index, end_index)
-        return {"storeListInPolygon": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_stores_by_polygon(coordinates, start_index, end_index, cursor=cursor, fields=fields)
+        return json_response({"storeListInPolygon": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -200,18 +430,27 @@ async def get_store_list_in_upjong(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("storeListInUpjong", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     indsLclsCd: str = Query(..., description="업종대분류코드"),
     indsMclsCd: str = Query(None, description="업종중분류코드"),
     indsSclsCd: str = Query(None, description="업종소분류코드"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """업종별 상가업소 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_stores_by_upjong(indsLclsCd, indsMclsCd, indsSclsCd, start_index, end_index)
-        return {"storeListInUpjong": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_stores_by_upjong(indsLclsCd, indsMclsCd, indsSclsCd, start_index, end_index, cursor=cursor, fields=fields)
+        return json_response({"storeListInUpjong": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -221,16 +460,25 @@ async def get_store_list_by_date(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("storeListByDate", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     modifiedTime: str = Query(..., description="수정일자"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    fields: Optional[str] = Query(None, description="응답 컬럼 (쉼표 구분, 예: bizesId,bizesNm,lat,lon)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """수정일자별 상가업소 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_stores_by_date(modifiedTime, start_index, end_index)
-        return {"storeListByDate": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_stores_by_date(modifiedTime, start_index, end_index, cursor=cursor, fields=fields)
+        return json_response({"storeListByDate": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -240,16 +488,24 @@ async def get_store_modify_info(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("reqStoreModify", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     bizesId: str = Query(..., description="상가업소번호"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """상가업소 변화정보 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_store_modify_info(bizesId, start_index, end_index)
-        return {"reqStoreModify": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_store_modify_info(bizesId, start_index, end_index, cursor=cursor)
+        return json_response({"reqStoreModify": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -259,15 +515,23 @@ async def get_large_upjong_list(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("largeUpjongList", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """상권정보 업종 대분류 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_large_upjong_list(start_index, end_index)
-        return {"largeUpjongList": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_large_upjong_list(start_index, end_index, cursor=cursor)
+        return json_response({"largeUpjongList": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -277,16 +541,24 @@ async def get_middle_upjong_list(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("middleUpjongList", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     indsLclsCd: str = Query(..., description="업종대분류코드"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """상권정보 업종 중분류 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_middle_upjong_list(indsLclsCd, start_index, end_index)
-        return {"middleUpjongList": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_middle_upjong_list(indsLclsCd, start_index, end_index, cursor=cursor)
+        return json_response({"middleUpjongList": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -296,17 +568,25 @@ async def get_small_upjong_list(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("smallUpjongList", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     indsLclsCd: str = Query(..., description="업종대분류코드"),
     indsMclsCd: str = Query(..., description="업종중분류코드"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """상권정보 업종 소분류 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_small_upjong_list(indsLclsCd, indsMclsCd, start_index, end_index)
-        return {"smallUpjongList": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_small_upjong_list(indsLclsCd, indsMclsCd, start_index, end_index, cursor=cursor)
+        return json_response({"smallUpjongList": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -316,22 +596,91 @@ async def get_store_zone_in_rectangle(
     key: str = Query(..., description="인증키"),
     type: str = Query("json", description="요청파일타입"),
     service: str = Query("storeZoneInRectangle", description="서비스명"),
-    start_index: int = Query(1, description="요청시작위치"),
+    start_index: int = Query(1, ge=1, description="요청시작위치"),
     end_index: int = Query(5, description="요청종료위치"),
     minx: float = Query(..., description="최소 X좌표"),
     miny: float = Query(..., description="최소 Y좌표"),
     maxx: float = Query(..., description="최대 X좌표"),
     maxy: float = Query(..., description="최대 Y좌표"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="다음 페이지 커서 (응답의 next_cursor)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """상권 영역정보 사각형좌표 조회"""
     try:
-        service_obj = StoreDataService(db)
-        result = service_obj.get_store_zone_in_rectangle(minx, miny, maxx, maxy, start_index, end_index)
-        return {"storeZoneInRectangle": {"list_total_count": len(result), "row": result}}
+        service_obj = AsyncStoreDataService(db)
+        result = await service_obj.get_store_zone_in_rectangle(minx, miny, maxx, maxy, start_index, end_index, cursor=cursor)
+        return json_response({"storeZoneInRectangle": {
+            "list_total_count": service_obj.total_count,
+            "total_count_estimated": service_obj.total_count_estimated,
+            "row": result,
+            "next_cursor": service_obj.next_cursor
+        }})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 16. 지역/업종별 상가 수 집계 조회
+@app.get("/storeStats")
+async def get_store_stats(
+    key: str = Query(..., description="인증키"),
+    type: str = Query("json", description="요청파일타입"),
+    service: str = Query("storeStats", description="서비스명"),
+    groupBy: str = Query("", description=f"집계 기준 (쉼표 구분: {','.join(AGGREGATE_DIMENSIONS)})"),
+    ctprvnCd: str = Query(None, description="시도코드"),
+    sggCd: str = Query(None, description="시군구코드"),
+    adongCd: str = Query(None, description="행정동코드"),
+    indsLclsCd: str = Query(None, description="업종대분류코드"),
+    indsMclsCd: str = Query(None, description="업종중분류코드"),
+    indsSclsCd: str = Query(None, description="업종소분류코드"),
+    limit: Optional[int] = Query(None, ge=1, description="최대 결과 수 (상가 수 내림차순)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """지역/업종별 상가 수 집계 조회 (집계 테이블 사용)"""
+    try:
+        service_obj = AsyncStoreDataService(db)
+        group_by = [field.strip() for field in groupBy.split(",") if field.strip()]
+        filters = {
+            "ctprvnCd": ctprvnCd, "sggCd": sggCd, "adongCd": adongCd,
+            "indsLclsCd": indsLclsCd, "indsMclsCd": indsMclsCd, "indsSclsCd": indsSclsCd
+        }
+        result = await service_obj.get_store_counts(group_by, filters, limit)
+        return json_response({"storeStats": {"list_total_count": service_obj.total_count, "row": result}})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# 17. 상가업소 데이터 내보내기 (스트리밍)
+@app.get("/storeExport")
+async def export_store_data(
+    key: str = Query(..., description="인증키"),
+    format: str = Query("ndjson", description=f"내보내기 형식 ({', '.join(EXPORT_MEDIA_TYPES)})"),
+    fields: str = Query("", description="쉼표로 구분된 컬럼 목록 (없으면 전체)"),
+    bbox: str = Query("", description="사각형 범위 (minx,miny,maxx,maxy)"),
+    ctprvnCd: str = Query(None, description="시도코드"),
+    sggCd: str = Query(None, description="시군구코드"),
+    adongCd: str = Query(None, description="행정동코드"),
+    indsLclsCd: str = Query(None, description="업종대분류코드"),
+    indsMclsCd: str = Query(None, description="업종중분류코드"),
+    indsSclsCd: str = Query(None, description="업종소분류코드")
+):
+    """조건에 맞는 상가업소 전체를 NDJSON/CSV/Parquet으로 스트리밍 (서버측 커서 사용)"""
+    try:
+        filters = {
+            "ctprvnCd": ctprvnCd, "sggCd": sggCd, "adongCd": adongCd,
+            "indsLclsCd": indsLclsCd, "indsMclsCd": indsMclsCd, "indsSclsCd": indsSclsCd
+        }
+        chunks = export_stores(format, parse_store_fields(fields), filters, parse_bbox(bbox))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="stores.{format}"'}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Index
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.dialects import mysql
 from sqlalchemy.sql import func
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 Base = declarative_base()
@@ -34,6 +35,7 @@ class Store(Base):
     # 위치 정보
     lon = Column(Float, comment="경도")
     lat = Column(Float, comment="위도")
+    geohash = Column(String(12), comment="geohash (공간 인덱스용)")
     
     # 건물 정보
     bldMngNo = Column(String(30), comment="건물관리번호")
@@ -48,6 +50,7 @@ class Store(Base):
     bdongCd = Column(String(10), comment="법정동코드")
     
     # 메타 정보 (MariaDB용 타임존 설정)
+    content_hash = Column(String(40), comment="데이터 해시 (변경 감지용)")
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
 
@@ -56,10 +59,134 @@ class Store(Base):
         Index('idx_store_location', 'brtcNm', 'sggNm', 'adongNm'),
         Index('idx_store_industry', 'indsLclsCd', 'indsMclsCd', 'indsSclsCd'),
         Index('idx_store_coord', 'lat', 'lon'),
+        Index('idx_store_geohash', 'geohash', 'lat', 'lon'),  # 반경/사각형/다각형 조회용 (좌표 확인까지 인덱스로 처리)
         Index('idx_store_bizesnm', 'bizesNm'),  # 상호명 검색용
+        Index('idx_store_updated_at', 'updated_at'),  # 수정일자별 조회용
         {'mysql_engine': 'InnoDB', 'mysql_charset': 'utf8mb4'}  # MariaDB/MySQL 옵션
     )
 
+class StoreChange(Base):
+    """상가업소 변경 이력 테이블 (append-only)"""
+    __tablename__ = "store_changes"
+
+    id = Column(Integer, primary_key=True)
+    bizesId = Column(String(50), nullable=False, comment="상가업소번호")
+    field = Column(String(50), nullable=False, comment="변경 필드")
+    old_value = Column(Text, comment="변경 전 값")
+    new_value = Column(Text, comment="변경 후 값")
+    changed_at = Column(DateTime, nullable=False, server_default=func.now(), comment="변경 시각")
+
+    __table_args__ = (
+        Index('idx_store_change_bizes', 'bizesId', 'changed_at'),
+        {'mysql_engine': 'InnoDB', 'mysql_charset': 'utf8mb4'}
+    )
+
+class SyncCheckpoint(Base):
+    """동기화 체크포인트 테이블 (지역별 재개 지점)"""
+    __tablename__ = "sync_checkpoints"
+
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String(100), unique=True, nullable=False, comment="동기화 범위 (엔드포인트:지역코드)")
+    last_modified = Column(String(8), comment="마지막 처리 수정일자 (YYYYMMDD)")
+    last_page = Column(Integer, default=0, nullable=False, comment="연속 완료된 마지막 페이지")
+    status = Column(String(20), default="completed", nullable=False, comment="running / completed")
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        {'mysql_engine': 'InnoDB', 'mysql_charset': 'utf8mb4'},
+    )
+
+class DataVersion(Base):
+    """데이터 버전 테이블 (상가 데이터가 바뀔 때마다 증가, 프로세스 간 캐시 무효화용)"""
+    __tablename__ = "data_versions"
+
+    name = Column(String(50), primary_key=True, comment="데이터 이름")
+    version = Column(Integer, nullable=False, default=0, comment="버전")
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        {'mysql_engine': 'InnoDB', 'mysql_charset': 'utf8mb4'},
+    )
+
+class StoreAggregate(Base):
+    """지역/업종/geohash 셀별 상가 수 집계 테이블 (상가 upsert시 증분 갱신)
+
+    차원 코드가 없는 상가는 빈 문자열로 집계한다 (NULL은 유니크 키에서 중복 허용되므로 사용하지 않음).
+    """
+    __tablename__ = "store_aggregates"
+
+    id = Column(Integer, primary_key=True)
+    
+    # 집계 차원 (코드)
+    ctprvnCd = Column(String(10), nullable=False, default="", comment="시도코드")
+    sggCd = Column(String(10), nullable=False, default="", comment="시군구코드")
+    adongCd = Column(String(10), nullable=False, default="", comment="행정동코드")
+    indsLclsCd = Column(String(10), nullable=False, default="", comment="업종대분류코드")
+    indsMclsCd = Column(String(10), nullable=False, default="", comment="업종중분류코드")
+    indsSclsCd = Column(String(10), nullable=False, default="", comment="업종소분류코드")
+    geohash6 = Column(String(6), nullable=False, default="", comment="geohash 6자리 셀 (약 1.2km x 0.6km)")
+    
+    # 차원 이름 (표시용)
+    brtcNm = Column(String(50), comment="시도명")
+    sggNm = Column(String(50), comment="시군구명")
+    adongNm = Column(String(50), comment="행정동명")
+    indsLclsNm = Column(String(100), comment="업종대분류명")
+    indsMclsNm = Column(String(100), comment="업종중분류명")
+    indsSclsNm = Column(String(100), comment="업종소분류명")
+    
+    store_count = Column(Integer, nullable=False, default=0, comment="상가 수")
+
+    __table_args__ = (
+        UniqueConstraint('ctprvnCd', 'sggCd', 'adongCd', 'indsLclsCd', 'indsMclsCd', 'indsSclsCd', 'geohash6',
+                         name='uq_store_aggregate'),
+        Index('idx_store_aggregate_industry', 'indsLclsCd', 'indsMclsCd', 'indsSclsCd'),
+        Index('idx_store_aggregate_geohash', 'geohash6'),
+        {'mysql_engine': 'InnoDB', 'mysql_charset': 'utf8mb4'}
+    )
+
+class StoreNameGram(Base):
+    """상호명 2-gram 색인 테이블 (상호명 부분 검색용, 상가 upsert시 함께 갱신)
+
+    소문자로 바꾼 상호명의 연속한 두 글자마다 한 행을 만들고, 마지막 글자는 한 글자 gram으로 저장한다.
+    gram은 대소문자/악센트를 구분하는 collation을 사용해 서로 다른 gram이 같은 키로 겹치지 않게 한다.
+    """
+    __tablename__ = "store_name_grams"
+
+    gram = Column(
+        String(2).with_variant(mysql.VARCHAR(2, collation="utf8mb4_bin"), "mysql", "mariadb"),
+        primary_key=True, comment="상호명 gram"
+    )
+    bizesId = Column(String(50), primary_key=True, comment="상가업소번호")
+
+    __table_args__ = (
+        Index('idx_store_name_gram_bizes', 'bizesId'),  # 상호명 변경시 기존 gram 삭제용
+        {'mysql_engine': 'InnoDB', 'mysql_charset': 'utf8mb4'}
+    )
+
+class StoreTag(Base):
+    """상가 업종 소분류 태그 테이블 (상호명 키워드 규칙으로 수집시 태깅)"""
+    __tablename__ = "store_tags"
+
+    bizesId = Column(String(50), primary_key=True, comment="상가업소번호")
+    tag = Column(String(100), primary_key=True, comment="태그 (대분류/소분류)")
+
+    __table_args__ = (
+        Index('idx_store_tag_tag', 'tag', 'bizesId'),  # 소분류 필터용
+        {'mysql_engine': 'InnoDB', 'mysql_charset': 'utf8mb4'}
+    )
+
+class TagRule(Base):
+    """태그별 적용된 규칙 해시 테이블 (규칙이 바뀐 태그만 다시 태깅)"""
+    __tablename__ = "tag_rules"
+
+    tag = Column(String(100), primary_key=True, comment="태그 (대분류/소분류)")
+    rule_hash = Column(String(40), nullable=False, comment="키워드 규칙 해시")
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        {'mysql_engine': 'InnoDB', 'mysql_charset': 'utf8mb4'},
+    )
+
 # Pydantic 모델들
 class StoreBase(BaseModel):
     bizesNm: Optional[str] = None
@@ -94,6 +221,9 @@ class StoreResponse(StoreBase):
     class Config:
         from_attributes = True
 
+class StoreBatchRequest(BaseModel):
+    bizesIds: List[str]
+
 class StoreSearch(BaseModel):
     brtc_nm: Optional[str] = None
     sgg_nm: Optional[str] = None
@@ -0,0 +1,127 @@
+import logging
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import insert, delete, distinct, func
+from sqlalchemy.orm import Session
+
+from models import Store, StoreNameGram
+
+logger = logging.getLogger(__name__)
+
+# 색인 재생성시 한 번에 읽는 상가 수
+NAME_INDEX_BATCH_SIZE = 5000
+
+def name_grams(name: str) -> Set[str]:
+    """상호명 색인 gram (소문자 기준 연속 두 글자 + 마지막 한 글자)"""
+    text = (name or "").lower()
+    return {text[i:i + 2] for i in range(len(text))}
+
+def keyword_grams(keyword: str) -> List[str]:
+    """키워드를 포함하는 상호명이 반드시 가지는 gram (한 글자 키워드는 그 글자 자체)"""
+    text = keyword.lower()
+    if len(text) < 2:
+        return [text] if text else []
+    return sorted({text[i:i + 2] for i in range(len(text) - 1)})
+
+def name_search_sql(keywords: List[str], params: Dict, prefix: str = "name") -> Tuple[str, str]:
+    """상호명에 키워드 중 하나라도 포함된 상가 조건 (원시 SQL용, params에 바인드 값 추가) -> (JOIN 절, WHERE 조건)
+
+    gram 색인으로 후보 bizesId를 찾고, 후보만 LIKE로 다시 확인한다.
+    - 두 글자 이상: 키워드의 모든 2-gram을 가진 상가 (gram 동등 조회)
+    - 한 글자: 그 글자로 시작하는 gram을 가진 상가 (gram 접두사 범위 조회)
+    키워드별 후보는 UNION으로 합친 파생 테이블로 stores에 조인한다.
+    (UNION이 있는 IN 서브쿼리는 MariaDB가 semi-join으로 바꾸지 못해 stores 행마다 서브쿼리를 실행함)
+    """
+    column = f"{prefix}_bizes_id"
+    candidates = []
+    likes = []
+    for i, keyword in enumerate(keywords):
+        grams = keyword_grams(keyword)
+        if not grams:
+            continue
+        names = [f"{prefix}{i}_{j}" for j in range(len(grams))]
+        params.update(zip(names, grams))
+        if len(keyword) < 2:
+            params[f"{names[0]}_end"] = chr(ord(grams[0]) + 1)
+            candidates.append(
+                f"SELECT bizesId AS {column} FROM store_name_grams "
+                f"WHERE gram >= :{names[0]} AND gram < :{names[0]}_end"
+            )
+        elif len(grams) == 1:
+            candidates.append(f"SELECT bizesId AS {column} FROM store_name_grams WHERE gram = :{names[0]}")
+        else:
+            placeholders = ", ".join(f":{name}" for name in names)
+            candidates.append(
+                f"SELECT bizesId AS {column} FROM store_name_grams WHERE gram IN ({placeholders}) "
+                f"GROUP BY bizesId HAVING COUNT(*) = {len(grams)}"
+            )
+        params[f"{prefix}{i}"] = f"%{keyword}%"
+        likes.append(f"bizesNm LIKE :{prefix}{i}")
+
+    if not candidates:
+        return "", "1=1"
+    join = f"JOIN ({' UNION '.join(candidates)}) {prefix}_match ON {prefix}_match.{column} = stores.bizesId"
+    return join, f"({' OR '.join(likes)})"
+
+class StoreNameIndex:
+    """상호명 gram 색인 관리"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, rows: List[Dict], old_rows: Dict[str, object]):
+        """신규 상가와 상호명이 바뀐 상가의 gram 갱신 (old_rows: bizesId -> 변경 전 행, 커밋은 호출측에서)"""
+        targets = [
+            row for row in rows
+            if row["bizesId"] not in old_rows
+            or getattr(old_rows[row["bizesId"]], "bizesNm", None) != row.get("bizesNm")
+        ]
+        stale = [row["bizesId"] for row in targets if row["bizesId"] in old_rows]
+        if stale:
+            self.db.execute(delete(StoreNameGram).where(StoreNameGram.bizesId.in_(stale)))
+
+        values = [
+            {"gram": gram, "bizesId": row["bizesId"]}
+            for row in targets for gram in name_grams(row.get("bizesNm"))
+        ]
+        if values:
+            self.db.execute(insert(StoreNameGram), values)
+
+    def rebuild(self, batch_size: int = NAME_INDEX_BATCH_SIZE) -> int:
+        """stores 테이블 전체 상호명으로 색인 재생성"""
+        self.db.execute(delete(StoreNameGram))
+        total = 0
+        last_id = 0
+        while True:
+            rows = self.db.query(Store.id, Store.bizesId, Store.bizesNm).filter(
+                Store.id > last_id
+            ).order_by(Store.id).limit(batch_size).all()
+            if not rows:
+                break
+            values = [{"gram": gram, "bizesId": r.bizesId} for r in rows for gram in name_grams(r.bizesNm)]
+            if values:
+                self.db.execute(insert(StoreNameGram), values)
+            total += len(values)
+            last_id = rows[-1].id
+        self.db.commit()
+
+        logger.info(f"상호명 색인 재생성 완료: gram {total}건")
+        return total
+
+    def is_consistent(self) -> bool:
+        """색인된 상가 수가 상호명이 있는 상가 수와 같은지 확인"""
+        indexed = self.db.query(func.count(distinct(StoreNameGram.bizesId))).scalar()
+        named = self.db.query(func.count(Store.id)).filter(
+            Store.bizesNm.isnot(None), Store.bizesNm != ""
+        ).scalar()
+        if indexed == named:
+            return True
+        logger.warning(f"상호명 색인 불일치: 색인 상가 {indexed}건, 상호명 있는 상가 {named}건")
+        return False
+
+    def ensure_built(self) -> bool:
+        """색인된 상가 수가 상호명이 있는 상가 수와 다르면(색인이 비어 있는 경우 포함) 재생성"""
+        if self.is_consistent():
+            return False
+        self.rebuild()
+        return True
@@ -0,0 +1,19 @@
+import base64
+import json
+from typing import Any, List
+
+def encode_cursor(values: List[Any]) -> str:
+    """마지막 행의 정렬키 값 목록을 불투명 커서 문자열로 변환"""
+    payload = json.dumps(values, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """커서 문자열을 정렬키 값 목록으로 복원"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError):
+        raise ValueError("커서 형식이 올바르지 않습니다.")
+    if not isinstance(values, list) or not values:
+        raise ValueError("커서 형식이 올바르지 않습니다.")
+    return values
@@ -0,0 +1,55 @@
+import os
+import logging
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+
+try:
+    import orjson  # 빠른 JSON 직렬화 (선택사항)
+except ImportError:
+    orjson = None
+
+try:
+    from brotli_asgi import BrotliMiddleware  # brotli 압축 (선택사항)
+except ImportError:
+    BrotliMiddleware = None
+
+logger = logging.getLogger(__name__)
+
+# orjson 응답 사용 여부 (orjson 패키지 필요)
+FAST_JSON_RESPONSE = os.getenv("FAST_JSON_RESPONSE", "false").lower() == "true"
+
+# 응답 압축 최소 크기 (bytes, 0이면 압축하지 않음)
+RESPONSE_COMPRESS_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESS_MIN_SIZE", 1024))
+
+def get_json_response_class(fast: bool = FAST_JSON_RESPONSE):
+    """조회 응답 클래스 (fast이고 orjson이 있으면 ORJSONResponse)"""
+    if fast and orjson is None:
+        logger.warning("orjson 패키지가 없어 기본 JSON 응답을 사용합니다.")
+    return ORJSONResponse if fast and orjson is not None else JSONResponse
+
+# 공용 조회 응답 클래스
+JSONResponseClass = get_json_response_class()
+
+def json_response(content: Dict) -> Response:
+    """조회 결과 JSON 응답
+
+    핸들러가 dict를 그대로 반환하면 FastAPI가 jsonable_encoder로 모든 값을 한 번 더 순회하므로,
+    응답 객체를 직접 만들어 변환 없이 바로 직렬화한다. (값은 str/int/float/None/list/dict만 사용)
+    """
+    return JSONResponseClass(content)
+
+def add_compression_middleware(app: FastAPI, minimum_size: int = RESPONSE_COMPRESS_MIN_SIZE) -> Optional[str]:
+    """Accept-Encoding에 따른 응답 압축 등록 (brotli-asgi가 있으면 br 우선, 없으면 gzip)
+
+    응답 캐시보다 바깥에서 압축하므로 인코딩이 달라도 ETag는 같다. 응답 캐시는 그래서 약한 ETag를 사용한다.
+    """
+    if minimum_size <= 0:
+        return None
+    if BrotliMiddleware is not None:
+        app.add_middleware(BrotliMiddleware, minimum_size=minimum_size, gzip_fallback=True)
+        return "br"
+    app.add_middleware(GZipMiddleware, minimum_size=minimum_size)
+    return "gzip"
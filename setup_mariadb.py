@@ -1,6 +1,7 @@
 import pymysql
 import logging
-from database import create_tables
+from database import create_tables, SessionLocal
+from data_service import StoreDataService
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -48,7 +49,16 @@ def main():
     if test_mariadb_connection():
         create_database()
         create_tables()
+        prepare_derived_tables()
         print("🎉 설정 완료! python main.py로 서버를 시작하세요.")
 
+def prepare_derived_tables():
+    """기존 상가 데이터로 geohash/집계/상호명 색인/태그 생성 (API 서버 시작 전에 한 번 실행)"""
+    db = SessionLocal()
+    try:
+        StoreDataService(db).prepare_derived_tables()
+    finally:
+        db.close()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
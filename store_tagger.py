@@ -0,0 +1,161 @@
+import logging
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import insert, delete, text
+from sqlalchemy.orm import Session
+
+from models import Store, StoreTag, TagRule
+from categories import category_rules, rule_hash
+
+logger = logging.getLogger(__name__)
+
+# 규칙 변경시 한 번에 다시 태깅하는 상가 수
+TAG_BATCH_SIZE = 5000
+
+class AhoCorasick:
+    """다중 키워드 동시 검색 오토마톤 (문자열을 한 번만 훑어 포함된 모든 키워드의 값을 찾음)"""
+
+    def __init__(self, patterns: Dict[str, Set[str]]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [set()]
+        for keyword, values in patterns.items():
+            node = 0
+            for char in keyword:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(set())
+                node = child
+            self._output[node] |= values
+
+        # 실패 링크 (너비 우선, 루트 자식은 루트로)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] |= self._output[self._fail[child]]
+
+    def search(self, text: str) -> Set[str]:
+        """text에 포함된 키워드들의 값"""
+        found = set()
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            if self._output[node]:
+                found |= self._output[node]
+        return found
+
+class TagMatcher:
+    """태그 규칙 묶음 (대분류 조건 + 상호명 키워드)"""
+
+    def __init__(self, rules: Dict[str, Tuple[str, List[str]]]):
+        self.main_categories = {tag: main_category for tag, (main_category, _) in rules.items()}
+        patterns = {}
+        for tag, (_, keywords) in rules.items():
+            for keyword in keywords:
+                patterns.setdefault(keyword, set()).add(tag)
+        self._automaton = AhoCorasick(patterns)
+
+    def tags(self, name: str, inds_lcls_nm: str) -> Set[str]:
+        """상가의 태그 (업종 대분류가 규칙의 대분류와 같고 상호명에 키워드가 있는 태그)"""
+        if not name or not inds_lcls_nm:
+            return set()
+        return {
+            tag for tag in self._automaton.search(name.lower())
+            if self.main_categories[tag] == inds_lcls_nm
+        }
+
+@lru_cache(maxsize=1)
+def default_matcher() -> TagMatcher:
+    """현재 categories 규칙 전체 매처"""
+    return TagMatcher(category_rules())
+
+def is_tag_current(conn, tag: str) -> bool:
+    """태그가 현재 규칙으로 태깅되어 있는지 (아니면 호출측에서 상호명 검색으로 대체)"""
+    rule = category_rules().get(tag)
+    if rule is None:
+        return False
+    try:
+        stored = conn.execute(text("SELECT rule_hash FROM tag_rules WHERE tag = :tag"), {"tag": tag}).scalar()
+    except Exception as e:
+        logger.warning(f"태그 규칙 조회 실패: {e}")
+        return False
+    return stored == rule_hash(*rule)
+
+class StoreTagger:
+    """상가 업종 소분류 태깅 (수집시 증분 태깅 + 규칙 변경시 해당 태그만 재태깅)"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, rows: List[Dict], old_rows: Dict[str, object]):
+        """신규 상가와 상호명/업종 대분류가 바뀐 상가의 태그 갱신 (커밋은 호출측에서)"""
+        targets = []
+        for row in rows:
+            old = old_rows.get(row["bizesId"])
+            if old is None or (old.bizesNm, old.indsLclsNm) != (row.get("bizesNm"), row.get("indsLclsNm")):
+                targets.append(row)
+        stale = [row["bizesId"] for row in targets if row["bizesId"] in old_rows]
+        if stale:
+            self.db.execute(delete(StoreTag).where(StoreTag.bizesId.in_(stale)))
+
+        matcher = default_matcher()
+        values = [
+            {"bizesId": row["bizesId"], "tag": tag}
+            for row in targets for tag in matcher.tags(row.get("bizesNm"), row.get("indsLclsNm"))
+        ]
+        if values:
+            self.db.execute(insert(StoreTag), values)
+
+    def sync_rules(self, batch_size: int = TAG_BATCH_SIZE) -> List[str]:
+        """규칙이 새로 생기거나 바뀐 태그만 전체 상가에 다시 태깅하고, 없어진 태그는 삭제"""
+        rules = category_rules()
+        hashes = {tag: rule_hash(*rule) for tag, rule in rules.items()}
+        stored = dict(self.db.query(TagRule.tag, TagRule.rule_hash))
+
+        changed = [tag for tag, value in hashes.items() if stored.get(tag) != value]
+        removed = [tag for tag in stored if tag not in hashes]
+        if not changed and not removed:
+            return []
+
+        self.db.execute(delete(StoreTag).where(StoreTag.tag.in_(changed + removed)))
+        self.db.execute(delete(TagRule).where(TagRule.tag.in_(changed + removed)))
+        if changed:
+            self._tag_all(TagMatcher({tag: rules[tag] for tag in changed}), batch_size)
+            self.db.execute(insert(TagRule), [{"tag": tag, "rule_hash": hashes[tag]} for tag in changed])
+        self.db.commit()
+
+        logger.info(f"태그 규칙 동기화 완료: 재태깅 {len(changed)}개, 삭제 {len(removed)}개")
+        return changed + removed
+
+    def _tag_all(self, matcher: TagMatcher, batch_size: int):
+        """규칙의 대분류에 속한 전체 상가 태깅 (id 순 배치)"""
+        main_categories = set(matcher.main_categories.values())
+        last_id = 0
+        while True:
+            rows = self.db.query(Store.id, Store.bizesId, Store.bizesNm, Store.indsLclsNm).filter(
+                Store.id > last_id,
+                Store.indsLclsNm.in_(main_categories)
+            ).order_by(Store.id).limit(batch_size).all()
+            if not rows:
+                break
+            values = [
+                {"bizesId": r.bizesId, "tag": tag}
+                for r in rows for tag in matcher.tags(r.bizesNm, r.indsLclsNm)
+            ]
+            if values:
+                self.db.execute(insert(StoreTag), values)
+            last_id = rows[-1].id
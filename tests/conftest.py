@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 프로젝트 루트 모듈(geo_utils, store_tagger 등) import 경로
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from geo_utils import PreparedPolygon, parse_polygon, prepare_polygon
+
+def _contains(coordinates, points):
+    lons = np.array([x for x, _ in points], dtype=float)
+    lats = np.array([y for _, y in points], dtype=float)
+    return prepare_polygon(coordinates).contains(lons, lats).tolist()
+
+def test_simple_polygon():
+    square = "0,0,10,0,10,10,0,10"
+    assert _contains(square, [(5, 5), (1, 9), (-1, 5), (11, 5), (5, 11)]) == [True, True, False, False, False]
+
+def test_concave_polygon():
+    # ㄷ자 모양 (오른쪽 가운데가 비어 있음)
+    shape = "POLYGON((0 0, 10 0, 10 3, 3 3, 3 7, 10 7, 10 10, 0 10, 0 0))"
+    assert _contains(shape, [(1, 5), (5, 5), (5, 1), (5, 9)]) == [True, False, True, True]
+
+def test_polygon_with_hole():
+    shape = "POLYGON((0 0, 10 0, 10 10, 0 10, 0 0), (4 4, 6 4, 6 6, 4 6, 4 4))"
+    assert _contains(shape, [(2, 2), (5, 5), (4.5, 5.5), (7, 5), (11, 5)]) == [True, False, False, True, False]
+
+def test_multipolygon_with_hole():
+    shape = (
+        "MULTIPOLYGON(((0 0, 4 0, 4 4, 0 4, 0 0)), "
+        "((10 10, 20 10, 20 20, 10 20, 10 10), (14 14, 16 14, 16 16, 14 16, 14 14)))"
+    )
+    points = [(2, 2), (7, 7), (12, 12), (15, 15), (18, 18), (25, 25)]
+    assert _contains(shape, points) == [True, False, True, False, True, False]
+    assert len(parse_polygon(shape)) == 2
+    assert prepare_polygon(shape).bbox == (0.0, 0.0, 20.0, 20.0)
+
+def test_batches_match_single_pass():
+    rng = np.random.default_rng(0)
+    shape = "POLYGON((0 0, 10 0, 10 10, 0 10, 0 0), (2 2, 8 2, 8 8, 2 8, 2 2))"
+    lons = rng.uniform(-1, 11, 2500)
+    lats = rng.uniform(-1, 11, 2500)
+    polygon = PreparedPolygon(parse_polygon(shape))
+    expected = polygon.contains(lons, lats)
+
+    polygon.BATCH_SIZE = 7
+    assert np.array_equal(polygon.contains(lons, lats), expected)
+
+    in_outer = (lons > 0) & (lons < 10) & (lats > 0) & (lats < 10)
+    in_hole = (lons > 2) & (lons < 8) & (lats > 2) & (lats < 8)
+    assert np.array_equal(expected, in_outer & ~in_hole)
+
+@pytest.mark.parametrize("coordinates", ["", "0,0,1,1", "0,0,1", "POLYGON()"])
+def test_invalid_polygon(coordinates):
+    with pytest.raises(ValueError):
+        parse_polygon(coordinates)
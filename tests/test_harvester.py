@@ -0,0 +1,85 @@
+import io
+import json
+
+from api_client import StoreAPIClient
+from harvester import StoreHarvester
+
+class _FakeResponse:
+    def __init__(self, body: bytes, content_type: str):
+        self.raw = io.BytesIO(body)
+        self.headers = {"content-type": content_type}
+
+    def close(self):
+        pass
+
+def _client(pages):
+    """pageNo별 응답 본문을 돌려주는 API 클라이언트 (네트워크/인증키 없이 실제 파서 사용)"""
+    client = StoreAPIClient.__new__(StoreAPIClient)
+    client.service_key = "test"
+    client._get = lambda endpoint, params, **kwargs: _FakeResponse(*pages[params["pageNo"]])
+    return client
+
+def _json_page(total_count, items):
+    body = {
+        "header": {"resultCode": "00", "resultMsg": "NORMAL SERVICE"},
+        "body": {"totalCount": total_count, "items": items}
+    }
+    return json.dumps(body).encode(), "application/json"
+
+def _harvest(pages, start_page=1):
+    harvester = StoreHarvester(_client(pages), max_workers=2, num_of_rows=2)
+    written, progress = [], []
+    result = harvester.harvest(
+        "ctprvnCd", "11",
+        lambda items: written.extend(items) or {"total_processed": len(items)},
+        start_page, progress.append
+    )
+    return result, written, progress
+
+def test_harvest_all_pages():
+    pages = {
+        1: _json_page(3, [{"bizesId": "1"}, {"bizesId": "2"}]),
+        2: _json_page(3, [{"bizesId": "3"}])
+    }
+    result, written, progress = _harvest(pages)
+    assert result["failed_pages"] == []
+    assert result["pages"] == 2
+    assert sorted(item["bizesId"] for item in written) == ["1", "2", "3"]
+    assert progress[-1] == 2
+
+def test_error_body_marks_first_page_failed():
+    body = {"header": {"resultCode": "22", "resultMsg": "LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR"}}
+    result, written, progress = _harvest({1: (json.dumps(body).encode(), "application/json")})
+    assert result["failed_pages"] == [1]
+    assert result["pages"] == 0
+    assert written == [] and progress == []
+
+def test_service_error_xml_marks_first_page_failed():
+    body = (
+        "<OpenAPI_ServiceResponse><cmmMsgHeader>"
+        "<errMsg>SERVICE ERROR</errMsg>"
+        "<returnAuthMsg>SERVICE_KEY_IS_NOT_REGISTERED_ERROR</returnAuthMsg>"
+        "<returnReasonCode>30</returnReasonCode>"
+        "</cmmMsgHeader></OpenAPI_ServiceResponse>"
+    ).encode()
+    result, _, progress = _harvest({1: (body, "text/xml")})
+    assert result["failed_pages"] == [1]
+    assert progress == []
+
+def test_error_body_on_later_page_is_failed():
+    body = {"header": {"resultCode": "22", "resultMsg": "LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR"}}
+    pages = {
+        1: _json_page(5, [{"bizesId": "1"}, {"bizesId": "2"}]),
+        2: (json.dumps(body).encode(), "application/json"),
+        3: _json_page(5, [{"bizesId": "5"}])
+    }
+    result, _, progress = _harvest(pages)
+    assert result["failed_pages"] == [2]
+    assert progress == [1]
+
+def test_no_data_result_is_empty_success():
+    body = {"header": {"resultCode": "03", "resultMsg": "NODATA_ERROR"}}
+    result, written, progress = _harvest({1: (json.dumps(body).encode(), "application/json")})
+    assert result["failed_pages"] == []
+    assert result["pages"] == 1
+    assert written == [] and progress == [1]
@@ -0,0 +1,46 @@
+import random
+
+from store_tagger import AhoCorasick, TagMatcher
+
+def _brute_force(patterns, text):
+    return {value for keyword, values in patterns.items() if keyword in text for value in values}
+
+def test_overlapping_keywords():
+    patterns = {"he": {"he"}, "she": {"she"}, "his": {"his"}, "hers": {"hers"}}
+    automaton = AhoCorasick(patterns)
+    assert automaton.search("ushers") == {"he", "she", "hers"}
+    assert automaton.search("this") == {"his"}
+    assert automaton.search("xyz") == set()
+    assert automaton.search("") == set()
+
+def test_korean_keywords():
+    patterns = {"치킨": {"치킨"}, "호프": {"치킨", "주점"}, "통닭": {"치킨"}, "회": {"일식"}}
+    automaton = AhoCorasick(patterns)
+    assert automaton.search("옛날통닭호프") == {"치킨", "주점"}
+    assert automaton.search("횟집") == set()
+    assert automaton.search("수산회센터") == {"일식"}
+
+def test_matches_brute_force():
+    rng = random.Random(0)
+    alphabet = "abc가나"
+    for _ in range(200):
+        patterns = {}
+        for _ in range(rng.randint(1, 8)):
+            keyword = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+            patterns.setdefault(keyword, set()).add(f"tag{rng.randint(0, 5)}")
+        automaton = AhoCorasick(patterns)
+        for _ in range(20):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            assert automaton.search(text) == _brute_force(patterns, text), (patterns, text)
+
+def test_tag_matcher_filters_by_main_category():
+    matcher = TagMatcher({
+        "음식/치킨": ("음식", ["치킨", "bbq"]),
+        "음식/카페": ("음식", ["카페", "coffee"]),
+        "숙박및음식점업/카페": ("숙박및음식점업", ["카페"]),
+    })
+    assert matcher.tags("BBQ 치킨카페", "음식") == {"음식/치킨", "음식/카페"}
+    assert matcher.tags("동네카페", "숙박및음식점업") == {"숙박및음식점업/카페"}
+    assert matcher.tags("Blue Coffee", "음식") == {"음식/카페"}
+    assert matcher.tags("동네카페", "소매") == set()
+    assert matcher.tags(None, "음식") == set()
@@ -13,18 +13,24 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import folium
+from folium.plugins import FastMarkerCluster, HeatMap
 from streamlit_folium import st_folium
 import requests
 import json
 from datetime import datetime
 import time
 import math
-import random
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
 import os
 import logging
 
+from name_index import name_search_sql
+from categories import industry_categories, category_tag
+from store_tagger import is_tag_current
+from geo_utils import geohash_cell_size, MAX_COVER_PRECISION
+from cache import STORE_DATA_VERSION
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -43,6 +49,16 @@ st.set_page_config(
 # API 엔드포인트
 LLM_API_URL = "http://localhost:8005"
 
+# 검색/통계 결과 캐시 유지 시간 (초)
+DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", 600))
+# 데이터 버전(동기화 시각) 확인 주기 (초). 버전이 바뀌면 이전 캐시는 더 이상 사용하지 않음
+DASHBOARD_VERSION_TTL = int(os.getenv("DASHBOARD_VERSION_TTL", 30))
+
+# 지도에 개별 좌표로 표시하는 최대 상가 수 (초과하면 geohash 셀 단위로 집계해 표시)
+DASHBOARD_MAP_POINT_LIMIT = int(os.getenv("DASHBOARD_MAP_POINT_LIMIT", 5000))
+# 지도 집계시 최대 셀 수 (검색 범위를 이 수 이하로 나누는 가장 높은 geohash 정밀도 사용)
+DASHBOARD_MAP_BUCKET_LIMIT = int(os.getenv("DASHBOARD_MAP_BUCKET_LIMIT", 2000))
+
 # 데이터베이스 연결
 @st.cache_resource
 def get_database_connection():
@@ -57,101 +73,6 @@ def get_database_connection():
 
 engine = get_database_connection()
 
-# === 실제 데이터베이스 구조에 맞는 업종 분류 시스템 ===
-# 실제 DB에는 대분류만 있으므로, 상가명(bizesNm)을 이용한 세부 분류
-industry_categories = {
-    "음식": {
-        "전체": [],  # 음식 전체
-        "치킨": ["치킨", "닭", "호프", "통닭", "후라이드", "양념", "BBQ", "교촌", "네네"],
-        "카페": ["카페", "커피", "스타벅스", "이디야", "커피빈", "엔젤리너스", "카페베네", "투썸", "Coffee"],
-        "한식": ["한식", "한정식", "분식", "국밥", "찌개", "백반", "삼겹살", "갈비", "불고기", "김치", "비빔밥"],
-        "중식": ["중식", "중국", "짜장면", "짬뽕", "탕수육", "양장피", "마파두부"],
-        "일식": ["일식", "초밥", "라면", "우동", "돈까스", "회", "사시미", "스시"],
-        "양식": ["양식", "스테이크", "파스타", "피자", "햄버거", "샐러드", "Pizza"],
-        "주점": ["술집", "호프", "포장마차", "노래방", "가라오케", "소주", "맥주", "Bar"],
-        "베이커리": ["빵집", "제과", "케이크", "베이커리", "파리바게트", "뚜레주르", "Bakery"],
-        "패스트푸드": ["맥도날드", "버거킹", "롯데리아", "KFC", "서브웨이", "McDonald", "Burger"]
-    },
-    "소매": {
-        "전체": [],  # 소매 전체
-        "편의점": ["편의점", "CU", "GS25", "세븐일레븐", "이마트24", "미니스톱", "Seven"],
-        "마트": ["마트", "슈퍼", "이마트", "롯데마트", "홈플러스", "하나로마트", "Mart", "Super"],
-        "의류": ["의류", "패션", "옷", "신발", "가방", "액세서리", "유니클로", "자라", "Fashion"],
-        "화장품": ["화장품", "미용", "올리브영", "아모레", "코스메틱", "Beauty"],
-        "문구": ["문구", "서점", "교보문고", "영풍문고", "학용품", "Book"],
-        "전자제품": ["전자", "핸드폰", "컴퓨터", "가전", "삼성", "LG", "Mobile"],
-        "약국": ["약국", "온누리약국", "365약국", "의약품", "Pharmacy"],
-        "기타": ["잡화", "생활용품", "가구", "인테리어", "꽃집", "선물"]
-    },
-    "생활서비스업": {
-        "전체": [],  # 생활서비스업 전체
-        "미용": ["미용실", "헤어", "네일", "피부", "마사지", "사우나", "찜질방", "Hair", "Beauty"],
-        "세탁": ["세탁소", "빨래방", "드라이클리닝", "Laundry"],
-        "수리": ["수리", "휴대폰수리", "시계수리", "신발수리", "열쇠", "Repair"],
-        "운송": ["택배", "퀵서비스", "이사", "배달", "운송", "Delivery"],
-        "청소": ["청소", "하우스클리닝", "사무실청소", "Cleaning"],
-        "기타": ["사진관", "인쇄", "복사", "자물쇠", "Photo"]
-    },
-    "숙박및음식점업": {
-        "전체": [],  # 숙박및음식점업 전체
-        "숙박": ["호텔", "모텔", "펜션", "게스트하우스", "리조트", "Hotel"],
-        "음식점": ["식당", "Restaurant", "레스토랑", "음식점", "요리"],
-        "카페": ["카페", "커피", "Coffee", "Cafe"],
-        "주점": ["술집", "호프", "Bar", "펍", "Pub"]
-    },
-    "도매및소매업": {
-        "전체": [],  # 도매및소매업 전체
-        "도매": ["도매", "총판", "유통", "납품"],
-        "소매": ["소매", "판매", "Shop", "Store"],
-        "무역": ["수출입", "무역", "통관", "Trade"],
-        "기타": ["중간유통", "대리점", "판매대행"]
-    },
-    "부동산업": {
-        "전체": [],  # 부동산업 전체
-        "부동산": ["부동산", "공인중개사", "임대", "매매", "Real Estate"],
-        "개발": ["건설", "아파트분양", "개발", "Construction"],
-        "관리": ["관리사무소", "경비", "시설관리", "Management"],
-        "기타": ["감정평가", "컨설팅"]
-    },
-    "교육": {
-        "전체": [],  # 교육 전체
-        "학원": ["학원", "교육", "과외", "입시", "Academy"],
-        "어학": ["어학원", "영어", "토익", "토플", "회화", "English"],
-        "컴퓨터": ["컴퓨터", "IT교육", "프로그래밍", "Computer"],
-        "예체능": ["피아노", "미술", "태권도", "발레", "음악", "Art"],
-        "기타": ["독서실", "도서관", "스터디룸", "Library"]
-    },
-    "보건업": {
-        "전체": [],  # 보건업 전체
-        "병원": ["병원", "의원", "클리닉", "내과", "외과", "Hospital"],
-        "치과": ["치과", "임플란트", "교정", "Dental"],
-        "한의원": ["한의원", "침술", "한방", "Oriental"],
-        "동물병원": ["동물병원", "애완동물", "수의사", "Animal"],
-        "기타": ["검진센터", "건강검진", "예방접종"]
-    },
-    "예술스포츠": {
-        "전체": [],  # 예술스포츠 전체
-        "스포츠": ["헬스장", "수영장", "골프", "테니스", "Gym", "Sports"],
-        "오락": ["노래방", "PC방", "당구장", "볼링장", "Game"],
-        "문화": ["영화관", "박물관", "전시관", "문화센터", "Cinema"],
-        "기타": ["공원", "VR체험"]
-    },
-    "하수폐기물": {
-        "전체": [],  # 하수폐기물 전체
-        "폐기물": ["폐기물", "재활용", "청소", "Waste"],
-        "환경": ["환경", "정화", "Environmental"],
-        "기타": ["기타"]
-    },
-    "일반서비스": {
-        "전체": [],  # 일반서비스 전체
-        "금융": ["은행", "보험", "증권", "대출", "ATM", "농협", "신협", "Bank"],
-        "법무": ["변호사", "법무사", "행정사", "공증", "Legal"],
-        "회계": ["회계", "세무사", "기장", "Tax"],
-        "자동차": ["자동차", "카센터", "타이어", "세차", "주유소", "Car"],
-        "기타": ["결혼정보", "장례식장", "웨딩", "Wedding"]
-    }
-}
-
 # 실제 데이터베이스의 전체 지역 분류 (15개 광역시/도, 139개 구/군) - 단순 리스트 형태
 regions = {
     "경기도": ["고양시 일산동구", "광주시", "구리시 교문동", "구리시 갈매동", "구리시 동구동", "구리시 수택동", "구리시 인창동", "군포시 당정동", "군포시 산본동", "김포시", "남양주시 와부읍", "남양주시 진전동", "부천시", "성남시", "수원시"],
@@ -171,19 +92,85 @@ regions = {
     "충청북도": ["단양군", "보은군", "영동군", "옥천군", "음성군", "제천시", "충주시 상모면", "괴산군"]
 }
 
+# 집계 테이블을 읽을 수 없을 때 사용하는 기본 인기 검색어 (키워드, 업체수, 업종중분류코드, 업종대분류명)
+DEFAULT_POPULAR_SEARCHES = [
+    ("마트", 7957, None, None), ("카페", 7723, None, None), ("약국", 5351, None, None),
+    ("치킨", 5155, None, None), ("미용실", 4339, None, None), ("병원", 1925, None, None),
+    ("세탁소", 1656, None, None), ("편의점", 654, None, None)
+]
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, show_spinner=False)
+def load_popular_searches(limit=8):
+    """업체수 상위 업종 중분류 (store_aggregates 집계 테이블에서 그룹 수만큼만 읽음)
+
+    버튼에 표시한 업체수와 클릭 후 검색 결과 수가 같도록 업종중분류코드를 함께 반환한다.
+    """
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT indsMclsCd, MAX(indsMclsNm) AS indsMclsNm, MAX(indsLclsNm) AS indsLclsNm,
+                       SUM(store_count) AS store_count
+                FROM store_aggregates
+                WHERE indsMclsCd <> '' AND store_count > 0
+                GROUP BY indsMclsCd
+                ORDER BY store_count DESC
+                LIMIT :limit
+            """), {"limit": limit}).fetchall()
+        if rows:
+            return [
+                (row.indsMclsNm, int(row.store_count), row.indsMclsCd, row.indsLclsNm)
+                for row in rows if row.indsMclsNm
+            ]
+    except Exception as e:
+        logger.error(f"Popular search load error: {e}")
+    return DEFAULT_POPULAR_SEARCHES
+
+def find_category_for_keyword(keyword):
+    """기본 인기 검색어(업종명)와 이름/키워드가 정확히 같은 (대분류, 소분류)"""
+    for main_cat, sub_cats in industry_categories.items():
+        for sub_cat, keywords in sub_cats.items():
+            if keyword == sub_cat or keyword in keywords:
+                return main_cat, sub_cat
+    return None, None
+
+def select_popular_search(keyword, mcls_cd, lcls_nm):
+    """인기 검색어 클릭시 필터 설정
+
+    업종중분류코드가 있으면 버튼의 업체수와 같은 indsMclsCd 조건으로 검색하고,
+    기본 인기 검색어(코드 없음)는 정확히 일치하는 소분류 키워드 검색으로 대체한다.
+    """
+    if mcls_cd:
+        st.session_state.selected_mcls = (mcls_cd, keyword)
+        st.session_state.selected_main_category = lcls_nm if lcls_nm in industry_categories else "전체"
+        st.session_state.selected_sub_category = "전체"
+        return True
+    
+    main_cat, sub_cat = find_category_for_keyword(keyword)
+    if not main_cat:
+        return False
+    st.session_state.selected_mcls = None
+    st.session_state.selected_main_category = main_cat
+    st.session_state.selected_sub_category = sub_cat
+    return True
+
 # 세션 상태 초기화
 if "search_results" not in st.session_state:
-    st.session_state.search_results = None
+    st.session_state.search_results = None  # 현재 페이지 검색 결과
+if "search_filters" not in st.session_state:
+    st.session_state.search_filters = None  # 현재 검색 필터 (정규화된 튜플)
+if "search_total" not in st.session_state:
+    st.session_state.search_total = 0  # 현재 검색 전체 건수
+if "page_cursors" not in st.session_state:
+    st.session_state.page_cursors = {}  # 페이지 -> 이전 페이지 마지막 (bizesNm, id)
 if "current_page" not in st.session_state:
     st.session_state.current_page = 1
 if "items_per_page" not in st.session_state:
     st.session_state.items_per_page = 10
+if "selected_mcls" not in st.session_state:
+    st.session_state.selected_mcls = None  # 인기 검색어로 선택한 (업종중분류코드, 이름)
 if "popular_searches" not in st.session_state:
-    # 인기 검색어와 실제 검색수 (키워드: 검색수)
-    st.session_state.popular_searches = [
-        ("마트", 7957), ("카페", 7723), ("약국", 5351), ("치킨", 5155),
-        ("미용실", 4339), ("병원", 1925), ("세탁소", 1656), ("편의점", 654)
-    ]
+    # 인기 검색어와 업체수 (집계 테이블 기준 상위 업종 중분류)
+    st.session_state.popular_searches = load_popular_searches()
 if "chat_messages" not in st.session_state:
     st.session_state.chat_messages = []
 if "show_ai_chat" not in st.session_state:
@@ -223,113 +210,314 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def search_stores_by_filters(main_category=None, sub_category=None, region=None, sub_region=None, limit=1000):
-    """실제 DB 구조에 맞는 필터 기반 상가 검색"""
-    try:
-        # 기본 쿼리
-        query = """
-        SELECT bizesId, bizesNm, indsLclsNm, brtcNm, sggNm, adongNm, rdnmAdr, lnoAdr
-        FROM stores 
-        WHERE 1=1
-        """
-        params = {}
-        
-        # 업종 필터 (DB의 indsLclsNm을 직접 사용)
-        if main_category and main_category != "전체":
-            # 대분류로 먼저 필터링
-            query += " AND indsLclsNm = :main_category"
-            params['main_category'] = main_category
-            
-            # 소분류가 있고 "전체"가 아닌 경우, 상가명으로 추가 필터링
-            if sub_category and sub_category != "전체":
-                keywords = industry_categories.get(main_category, {}).get(sub_category, [])
-                if keywords:
-                    # 상가명에서 키워드 검색
-                    keyword_conditions = " OR ".join([f"bizesNm LIKE :keyword{i}" for i in range(len(keywords))])
-                    query += f" AND ({keyword_conditions})"
-                    for i, keyword in enumerate(keywords):
-                        params[f'keyword{i}'] = f'%{keyword}%'
-        
-        # 지역 필터
-        if region and region != "전체":
-            query += " AND brtcNm = :region"
-            params['region'] = region
-            
-            if sub_region and sub_region != "전체":
-                query += " AND sggNm = :sub_region"
-                params['sub_region'] = sub_region
+# 검색 결과 컬럼 (마지막 id는 keyset 페이지네이션용)
+SEARCH_COLUMNS = "bizesId, bizesNm, indsLclsNm, brtcNm, sggNm, adongNm, rdnmAdr, lnoAdr, id"
+
+def build_search_conditions(main_category=None, sub_category=None, region=None, sub_region=None,
+                            mcls_cd=None):
+    """필터 FROM 절(stores + 조인), 조건 SQL과 바인드 값 (검색 결과/건수 조회 공용)"""
+    tables = "stores"
+    conditions = []
+    params = {}
+    
+    # 업종 중분류 필터 (인기 검색어, idx_store_industry 인덱스)
+    if mcls_cd:
+        conditions.append("indsMclsCd = :mcls_cd")
+        params['mcls_cd'] = mcls_cd
+    
+    # 업종 필터 (DB의 indsLclsNm을 직접 사용)
+    if main_category and main_category != "전체":
+        # 대분류로 먼저 필터링
+        conditions.append("indsLclsNm = :main_category")
+        params['main_category'] = main_category
         
-        query += f" ORDER BY bizesNm LIMIT {limit}"
+        # 소분류가 있고 "전체"가 아닌 경우, 상가명으로 추가 필터링
+        if sub_category and sub_category != "전체":
+            keywords = industry_categories.get(main_category, {}).get(sub_category, [])
+            tag = category_tag(main_category, sub_category)
+            with engine.connect() as conn:
+                tagged = is_tag_current(conn, tag)
+            if tagged:
+                # 수집시 태깅된 소분류 태그로 조회 (store_tags 인덱스 동등 조회)
+                conditions.append("bizesId IN (SELECT bizesId FROM store_tags WHERE tag = :tag)")
+                params['tag'] = tag
+            elif keywords:
+                # 태그가 아직 현재 규칙으로 갱신되지 않았으면 상가명 키워드 검색 (store_name_grams 색인 + LIKE 확인)
+                join, condition = name_search_sql(keywords, params, 'keyword')
+                tables = f"{tables} {join}" if join else tables
+                conditions.append(condition)
+    
+    # 지역 필터
+    if region and region != "전체":
+        conditions.append("brtcNm = :region")
+        params['region'] = region
         
+        if sub_region and sub_region != "전체":
+            conditions.append("sggNm = :sub_region")
+            params['sub_region'] = sub_region
+    
+    return tables, " AND ".join(conditions) or "1=1", params
+
+def keyset_condition(after, params):
+    """(bizesNm, id) 순서에서 after 다음 행 조건 (bizesNm이 NULL인 행이 가장 앞)"""
+    after_name, after_id = after
+    params['after_id'] = after_id
+    if after_name is None:
+        return "(bizesNm IS NOT NULL OR id > :after_id)"
+    params['after_name'] = after_name
+    return "(bizesNm > :after_name OR (bizesNm = :after_name AND id > :after_id))"
+
+def count_stores_by_filters(main_category=None, sub_category=None, region=None, sub_region=None, mcls_cd=None):
+    """필터 기반 검색 결과 전체 건수"""
+    tables, where, params = build_search_conditions(main_category, sub_category, region, sub_region, mcls_cd)
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT COUNT(*) FROM {tables} WHERE {where}"), params).scalar() or 0
+
+def search_stores_by_filters(main_category=None, sub_category=None, region=None, sub_region=None, mcls_cd=None,
+                             limit=10, after=None, offset=0, reverse=False):
+    """실제 DB 구조에 맞는 필터 기반 상가 검색 (한 페이지, bizesNm/id 순)
+
+    after가 있으면 이전 페이지 마지막 행의 (bizesNm, id) 다음부터 읽고(keyset), 없으면 offset부터 읽는다.
+    reverse는 마지막 페이지를 역순으로 읽을 때 사용하며, 결과는 항상 정순으로 반환한다.
+    """
+    tables, where, params = build_search_conditions(main_category, sub_category, region, sub_region, mcls_cd)
+    if after is not None:
+        where += " AND " + keyset_condition(after, params)
+    
+    direction = "DESC" if reverse else "ASC"
+    query = f"SELECT {SEARCH_COLUMNS} FROM {tables} WHERE {where} ORDER BY bizesNm {direction}, id {direction} LIMIT :limit"
+    params['limit'] = limit
+    if offset:
+        query += " OFFSET :offset"
+        params['offset'] = offset
+    
+    with engine.connect() as conn:
+        rows = [tuple(row) for row in conn.execute(text(query), params)]
+    return rows[::-1] if reverse else rows
+
+def map_precision(min_lat, max_lat, min_lon, max_lon, max_cells=DASHBOARD_MAP_BUCKET_LIMIT):
+    """범위를 max_cells 이하의 셀로 나누는 가장 높은 geohash 정밀도 (지도 집계 단위)"""
+    for precision in range(MAX_COVER_PRECISION, 1, -1):
+        lat_size, lon_size = geohash_cell_size(precision)
+        rows = math.floor((max_lat - min_lat) / lat_size) + 2
+        cols = math.floor((max_lon - min_lon) / lon_size) + 2
+        if rows * cols <= max_cells:
+            return precision
+    return 1
+
+def load_map_data(main_category=None, sub_category=None, region=None, sub_region=None, mcls_cd=None,
+                  point_limit=DASHBOARD_MAP_POINT_LIMIT, max_cells=DASHBOARD_MAP_BUCKET_LIMIT):
+    """검색 조건 전체 상가의 지도 데이터 (좌표가 있는 상가 기준)
+    
+    상가 수가 point_limit 이하면 개별 좌표 [lat, lon, 상호명, 1]을,
+    초과하면 geohash 앞 몇 자리 셀별 [평균 lat, 평균 lon, 셀, 상가 수]를 DB에서 집계해 반환한다.
+    count는 지도에 표시한 상가 수이고, 셀 집계에서 빠진 geohash 미생성 상가 수는 unplaced로 따로 반환한다.
+    """
+    tables, where, params = build_search_conditions(main_category, sub_category, region, sub_region, mcls_cd)
+    where += " AND lat IS NOT NULL AND lon IS NOT NULL"
+    
+    with engine.connect() as conn:
+        extent = conn.execute(text(
+            f"SELECT COUNT(*), MIN(lat), MAX(lat), MIN(lon), MAX(lon) FROM {tables} WHERE {where}"
+        ), params).one()
+        count = extent[0] or 0
+        if not count:
+            return {"count": 0, "unplaced": 0, "bounds": None, "precision": None, "rows": []}
+        bounds = [[extent[1], extent[3]], [extent[2], extent[4]]]
+    
+        if count <= point_limit:
+            rows = [
+                [row.lat, row.lon, row.bizesNm or "", 1]
+                for row in conn.execute(text(f"SELECT lat, lon, bizesNm FROM {tables} WHERE {where}"), params)
+            ]
+            return {"count": count, "unplaced": 0, "bounds": bounds, "precision": None, "rows": rows}
+    
+        precision = map_precision(extent[1], extent[2], extent[3], extent[4], max_cells)
+        params['precision'] = precision
+        rows = [
+            [row.lat, row.lon, row.cell, int(row.store_count)]
+            for row in conn.execute(text(f"""
+                SELECT SUBSTR(geohash, 1, :precision) AS cell, COUNT(*) AS store_count,
+                       AVG(lat) AS lat, AVG(lon) AS lon
+                FROM {tables}
+                WHERE {where} AND geohash IS NOT NULL
+                GROUP BY cell
+            """), params)
+        ]
+    placed = sum(row[3] for row in rows)
+    return {"count": placed, "unplaced": count - placed, "bounds": bounds, "precision": precision, "rows": rows}
+
+def normalize_filters(main_category=None, sub_category=None, region=None, sub_region=None, mcls_cd=None):
+    """검색 필터 정규화 ("전체"/빈 값은 None, 상위 필터가 없으면 하위 필터 무시) -> 캐시 키 튜플"""
+    def value(selected):
+        return selected if selected and selected != "전체" else None
+    
+    main_category, region = value(main_category), value(region)
+    return (
+        main_category, value(sub_category) if main_category else None,
+        region, value(sub_region) if region else None,
+        mcls_cd or None
+    )
+
+@st.cache_data(ttl=DASHBOARD_VERSION_TTL, show_spinner=False)
+def get_data_version():
+    """데이터 버전 (마지막 동기화 체크포인트 시각 + 공유 데이터 버전, 짧은 TTL로만 확인)
+
+    공유 데이터 버전(data_versions)은 상가 신규 생성/upsert마다 증가하므로
+    updated_at이 비어 있는 신규 상가도 버전에 반영된다.
+    """
+    try:
         with engine.connect() as conn:
-            result = conn.execute(text(query), params)
-            return result.fetchall()
-            
+            row = conn.execute(text(
+                "SELECT (SELECT MAX(updated_at) FROM sync_checkpoints), "
+                "(SELECT version FROM data_versions WHERE name = :name)"
+            ), {"name": STORE_DATA_VERSION}).one()
+        return f"{row[0]}|{row[1]}"
+    except Exception as e:
+        logger.error(f"Data version error: {e}")
+        return ""
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, show_spinner=False, max_entries=1000)
+def cached_count_stores(filters, data_version):
+    """필터별 전체 건수 (data_version이 바뀌면 다시 조회)"""
+    return count_stores_by_filters(*filters)
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, show_spinner=False, max_entries=5000)
+def cached_search_page(filters, limit, after, offset, reverse, data_version):
+    """필터/페이지 위치별 검색 결과 (data_version이 바뀌면 다시 조회)"""
+    return search_stores_by_filters(*filters, limit=limit, after=after, offset=offset, reverse=reverse)
+
+@st.cache_data(ttl=DASHBOARD_CACHE_TTL, show_spinner=False, max_entries=200)
+def cached_map_data(filters, data_version):
+    """필터별 지도 데이터 (data_version이 바뀌면 다시 조회)"""
+    return load_map_data(*filters)
+
+def clear_search_cache():
+    """검색/통계 캐시 전체 무효화 (DB 동기화 직후 수동 갱신용)"""
+    get_data_version.clear()
+    cached_count_stores.clear()
+    cached_search_page.clear()
+    cached_map_data.clear()
+    load_popular_searches.clear()
+
+def load_search_page(filters, page, items_per_page):
+    """현재 페이지 검색 결과
+
+    방문한 페이지의 마지막 (bizesNm, id)를 다음 페이지 커서로 기억해 다음 페이지는 keyset으로 읽는다.
+    마지막 페이지는 역순으로, 커서가 없는 페이지(직접 이동)는 offset으로 읽는다.
+    같은 필터/위치의 결과는 데이터 버전이 바뀔 때까지 캐시에서 읽는다.
+    """
+    cursors = st.session_state.page_cursors
+    total = st.session_state.search_total
+    total_pages = max(math.ceil(total / items_per_page), 1)
+    
+    try:
+        data_version = get_data_version()
+        if page in cursors:
+            rows = cached_search_page(filters, items_per_page, cursors[page], 0, False, data_version)
+        elif page > 1 and page == total_pages:
+            rows = cached_search_page(filters, total - (page - 1) * items_per_page, None, 0, True, data_version)
+        else:
+            rows = cached_search_page(filters, items_per_page, None, (page - 1) * items_per_page, False, data_version)
     except Exception as e:
         logger.error(f"Search error: {e}")
         return []
+    
+    if rows:
+        cursors[page + 1] = (rows[-1][1], rows[-1][-1])
+    return rows
+
+# 지도 마커 생성 (행: [lat, lon, 상호명 또는 셀, 상가 수])
+# 상호명은 공공데이터 원문이므로 HTML로 해석되지 않게 textContent로 툴팁 요소를 만든다
+MAP_MARKER_CALLBACK = """
+var callback = function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {count: row[3]});
+    var label = document.createElement('span');
+    label.textContent = row[3] > 1 ? row[3].toLocaleString() + '개 업소' : String(row[2]);
+    marker.bindTooltip(label);
+    return marker;
+};
+"""
+
+# 클러스터 아이콘 (자식 마커 수가 아니라 마커별 상가 수 합계 표시)
+MAP_CLUSTER_ICON = """
+function (cluster) {
+    var total = 0;
+    cluster.getAllChildMarkers().forEach(function (marker) { total += marker.options.count || 1; });
+    var size = total < 100 ? 'small' : (total < 1000 ? 'medium' : 'large');
+    return L.divIcon({
+        html: '<div><span>' + total.toLocaleString() + '</span></div>',
+        className: 'marker-cluster marker-cluster-' + size,
+        iconSize: new L.Point(40, 40)
+    });
+}
+"""
 
-def display_map_results(results):
-    """검색 결과를 지도로 표시"""
-    if not results:
+def display_map_results(filters, total_items):
+    """검색 조건 전체 결과를 실제 좌표로 지도에 표시 (마커 클러스터 + 히트맵)"""
+    if not total_items:
         st.warning("지도에 표시할 검색 결과가 없습니다.")
         return
     
-    st.markdown(f"**총 {len(results):,}개 업소 위치 (지도 표시)**")
-    
     # 지도 렌더링 시작
     with st.spinner("🗺️ 지도를 로딩 중입니다..."):
         try:
-            # 서울 중심 좌표
-            center_lat, center_lng = 37.5665, 126.9780
+            map_data = cached_map_data(filters, get_data_version())
+            if not map_data["rows"]:
+                st.warning("좌표가 있는 업소가 없어 지도에 표시할 수 없습니다.")
+                return
             
-            # 가장 간단한 Folium 지도 생성
-            m = folium.Map(
-                location=[center_lat, center_lng],
-                zoom_start=10
-            )
+            rows = map_data["rows"]
+            if map_data["precision"]:
+                st.markdown(
+                    f"**총 {map_data['count']:,}개 업소 위치 (geohash {map_data['precision']}자리 셀 {len(rows):,}개로 집계)**"
+                )
+            else:
+                st.markdown(f"**총 {map_data['count']:,}개 업소 위치 (지도 표시)**")
             
-            # 검색 결과를 지도에 마커로 추가 (최대 20개로 제한)
-            display_count = min(20, len(results))
+            m = folium.Map(location=[37.5665, 126.9780], zoom_start=10, prefer_canvas=True)
+            m.fit_bounds(map_data["bounds"], max_zoom=16)
             
-            for i, store in enumerate(results[:display_count]):
-                # 매우 간단한 랜덤 좌표 생성 (서울 근처)
-                lat = center_lat + (random.random() - 0.5) * 0.1
-                lng = center_lng + (random.random() - 0.5) * 0.1
-                
-                # 기본 마커 추가
-                folium.Marker(
-                    location=[lat, lng],
-                    popup=store[1],  # 업소명만 표시
-                    tooltip=store[1]
-                ).add_to(m)
+            # 상가 수 가중 히트맵 (집계시 기본 표시)
+            max_count = max(row[3] for row in rows)
+            HeatMap(
+                [[row[0], row[1], row[3] / max_count] for row in rows],
+                name="🔥 밀집도",
+                radius=15,
+                show=bool(map_data["precision"])
+            ).add_to(m)
             
-            # 가장 기본적인 지도 표시
-            st_folium(m, width=600, height=350)
+            # 브라우저에서 한 번에 생성하는 마커 클러스터
+            FastMarkerCluster(
+                rows,
+                callback=MAP_MARKER_CALLBACK,
+                name="📍 업소 위치",
+                icon_create_function=MAP_CLUSTER_ICON
+            ).add_to(m)
+            folium.LayerControl(collapsed=False).add_to(m)
             
-            st.success(f"✅ {display_count}개 업소 위치가 지도에 표시되었습니다.")
+            # 지도 조작 결과는 사용하지 않으므로 반환 값 없이 표시 (확대/이동시 재실행 방지)
+            st_folium(m, width=700, height=450, returned_objects=[])
             
-            if len(results) > display_count:
-                st.info(f"⚡ 성능을 위해 처음 {display_count}개 업소만 표시합니다.")
+            without_coords = total_items - map_data["count"] - map_data["unplaced"]
+            if without_coords > 0:
+                st.info(f"ℹ️ 좌표가 없는 {without_coords:,}개 업소는 지도에서 제외되었습니다.")
+            if map_data["unplaced"]:
+                st.info(f"ℹ️ geohash가 아직 생성되지 않은 {map_data['unplaced']:,}개 업소는 셀 집계 지도에서 제외되었습니다. "
+                        "(python setup_mariadb.py 실행 필요)")
                 
         except Exception as e:
             st.error("⚠️ 지도 로딩에 실패했습니다")
             st.code(f"오류 내용: {str(e)}")
             st.info("🔄 페이지를 새로고침하거나 목록 보기를 이용해주세요.")
 
-def display_search_results(results, page=1, items_per_page=10):
-    """검색 결과를 카드 형태로 페이지네이션하여 표시"""
-    if not results:
+def display_search_results(page_results, total_items, page=1, items_per_page=10):
+    """검색 결과(현재 페이지)를 카드 형태로 표시하고 페이지 이동 컨트롤 제공"""
+    if not page_results:
         st.warning("검색 결과가 없습니다.")
         return
     
-    total_items = len(results)
-    total_pages = math.ceil(total_items / items_per_page)
-    
-    # 페이지네이션 정보
-    start_idx = (page - 1) * items_per_page
-    end_idx = min(start_idx + items_per_page, total_items)
-    page_results = results[start_idx:end_idx]
+    total_pages = max(math.ceil(total_items / items_per_page), 1)
     
     # 결과 정보 표시
     st.markdown(f"**검색 결과: {total_items:,}개** (페이지 {page}/{total_pages})")
@@ -460,36 +648,31 @@ with col1:
     
     # 1행: 상위 4개
     popular_row1 = st.columns(4)
-    for idx, (keyword, count) in enumerate(st.session_state.popular_searches[:4]):
+    for idx, (keyword, count, mcls_cd, lcls_nm) in enumerate(st.session_state.popular_searches[:4]):
         with popular_row1[idx]:
             if st.button(f"{keyword}\n({count:,}개)", key=f"popular_{idx}", help=f"{keyword} 관련 업체 {count:,}개"):
                 # 인기 검색어로 필터 설정
-                for main_cat, sub_cats in industry_categories.items():
-                    for sub_cat, keywords in sub_cats.items():
-                        if keyword in keywords:
-                            st.session_state.selected_main_category = main_cat
-                            st.session_state.selected_sub_category = sub_cat
-                            st.rerun()
+                if select_popular_search(keyword, mcls_cd, lcls_nm):
+                    st.rerun()
     
     # 2행: 하위 4개
     popular_row2 = st.columns(4)
-    for idx, (keyword, count) in enumerate(st.session_state.popular_searches[4:8]):
+    for idx, (keyword, count, mcls_cd, lcls_nm) in enumerate(st.session_state.popular_searches[4:8]):
         with popular_row2[idx]:
             if st.button(f"{keyword}\n({count:,}개)", key=f"popular_{idx+4}", help=f"{keyword} 관련 업체 {count:,}개"):
                 # 인기 검색어로 필터 설정
-                for main_cat, sub_cats in industry_categories.items():
-                    for sub_cat, keywords in sub_cats.items():
-                        if keyword in keywords:
-                            st.session_state.selected_main_category = main_cat
-                            st.session_state.selected_sub_category = sub_cat
-                            st.rerun()
+                if select_popular_search(keyword, mcls_cd, lcls_nm):
+                    st.rerun()
 
 with col2:
     # 전체 초기화 (챗봇 입력창 + 필터 검색 모두 초기화)
     if st.button("🔄 전체 초기화"):
         # 검색 관련 초기화
         st.session_state.search_results = None
+        st.session_state.search_filters = None
+        st.session_state.page_cursors = {}
         st.session_state.current_page = 1
+        st.session_state.selected_mcls = None
         if 'selected_main_category' in st.session_state:
             del st.session_state.selected_main_category
         if 'selected_sub_category' in st.session_state:
@@ -573,24 +756,45 @@ with filter_row2_col3:
     # 빈 공간 (균형을 위해)
     st.empty()
 
+# 인기 검색어 업종 중분류 필터 (업종 대분류/소분류를 직접 바꾸면 해제)
+if st.session_state.selected_mcls and (
+    selected_main_category != st.session_state.get('selected_main_category', '전체')
+    or selected_sub_category != "전체"
+):
+    st.session_state.selected_mcls = None
+selected_mcls_cd = st.session_state.selected_mcls[0] if st.session_state.selected_mcls else None
+if st.session_state.selected_mcls:
+    st.caption(f"업종 중분류: {st.session_state.selected_mcls[1]}")
+
 # 검색 실행
-if search_clicked or (selected_main_category != "전체" or selected_region != "전체"):
+if search_clicked or (selected_main_category != "전체" or selected_region != "전체" or selected_mcls_cd):
     # 세션 상태 업데이트
     st.session_state.selected_main_category = selected_main_category
     st.session_state.selected_sub_category = selected_sub_category
     st.session_state.selected_region = selected_region
     st.session_state.selected_sub_region = selected_sub_region
-    st.session_state.current_page = 1  # 새 검색시 첫 페이지로
     
-    # 검색 실행
+    search_filters = normalize_filters(
+        selected_main_category, selected_sub_category, selected_region, selected_sub_region, selected_mcls_cd
+    )
+    
+    # 검색 실행 (필터가 바뀌면 첫 페이지로, 같은 필터/페이지는 데이터가 바뀔 때까지 캐시 사용)
     with st.spinner("검색 중..."):
-        results = search_stores_by_filters(
-            main_category=selected_main_category,
-            sub_category=selected_sub_category,
-            region=selected_region,
-            sub_region=selected_sub_region
+        if search_clicked or search_filters != st.session_state.search_filters:
+            st.session_state.search_filters = search_filters
+            st.session_state.page_cursors = {}
+            st.session_state.current_page = 1  # 새 검색시 첫 페이지로
+        
+        try:
+            st.session_state.search_total = cached_count_stores(search_filters, get_data_version())
+        except Exception as e:
+            logger.error(f"Count error: {e}")
+            st.session_state.search_total = 0
+        st.session_state.search_results = load_search_page(
+            search_filters,
+            st.session_state.current_page,
+            st.session_state.items_per_page
         )
-        st.session_state.search_results = results
 
 # 검색 결과 표시
 if st.session_state.search_results is not None:
@@ -602,13 +806,14 @@ if st.session_state.search_results is not None:
     
     with result_tabs[0]:
         display_search_results(
-            st.session_state.search_results, 
+            st.session_state.search_results,
+            st.session_state.search_total,
             page=st.session_state.current_page,
             items_per_page=st.session_state.items_per_page
         )
     
     with result_tabs[1]:
-        display_map_results(st.session_state.search_results)
+        display_map_results(st.session_state.search_filters, st.session_state.search_total)
 
 # 사이드바
 with st.sidebar:
@@ -642,6 +847,13 @@ with st.sidebar:
     except:
         st.error("❌ 데이터베이스 오류")
     
+    # 검색 캐시 (데이터 동기화 시각이 바뀌면 자동 갱신, 즉시 반영이 필요하면 수동 초기화)
+    st.caption(f"데이터 기준: {get_data_version().split('|')[0] or 'N/A'}")
+    if st.button("♻️ 검색 캐시 새로고침"):
+        clear_search_cache()
+        st.session_state.page_cursors = {}
+        st.rerun()
+    
     # LLM API 상태
     try:
         health = requests.get(f"{LLM_API_URL}/health", timeout=2)
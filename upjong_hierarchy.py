@@ -0,0 +1,147 @@
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import Store
+from cache import count_cache
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+class UpjongNode:
+    """업종 분류 노드 (코드, 이름, 상가 수, 하위 분류)"""
+
+    __slots__ = ("code", "name", "count", "children", "_name_counts")
+
+    def __init__(self, code: str):
+        self.code = code
+        self.name = None
+        self.count = 0
+        self.children = {}
+        self._name_counts = {}
+
+    def add(self, name: Optional[str], count: int):
+        """상가 수 누적 (코드에 이름이 여러 개면 상가가 가장 많은 이름 사용)"""
+        self.count += count
+        if name:
+            self._name_counts[name] = self._name_counts.get(name, 0) + count
+            self.name = max(self._name_counts, key=self._name_counts.get)
+
+    def sorted_children(self) -> List["UpjongNode"]:
+        return [self.children[code] for code in sorted(self.children)]
+
+class UpjongHierarchy:
+    """대/중/소분류 업종 트리 (메모리 상주)
+
+    stores 테이블을 한 번의 GROUP BY로 읽어 트리를 만든다.
+    API 워커는 공유 데이터 버전이 바뀌면 캐시를 무효화하기 전에 새 버전의 트리를 한 번 만들고,
+    그동안 조회는 이전 트리를 그대로 사용한다. 트리가 데이터 버전(count_cache.version)보다 오래되었으면
+    백그라운드 스레드 하나만 다시 만들며, 트리가 아직 없을 때만 조회 요청에서 직접 만든다.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+        self._root = None
+        self._version = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()  # 트리 생성은 한 번에 하나만
+
+    def refresh(self, db: Session, version: int = None) -> UpjongNode:
+        """트리 재생성 (version: 트리가 반영하는 데이터 버전, 기본값은 현재 캐시 버전)"""
+        with self._build_lock:
+            return self._build(db, count_cache.version if version is None else version)
+
+    def refresh_in_new_session(self, version: int = None) -> UpjongNode:
+        """별도 세션으로 트리 재생성 (요청 세션이 없는 백그라운드/버전 확인 작업용)"""
+        db = self.session_factory()
+        try:
+            return self.refresh(db, version)
+        finally:
+            db.close()
+
+    def _build(self, db: Session, version: int) -> UpjongNode:
+        rows = db.query(
+            Store.indsLclsCd, Store.indsLclsNm,
+            Store.indsMclsCd, Store.indsMclsNm,
+            Store.indsSclsCd, Store.indsSclsNm,
+            func.count(Store.id)
+        ).filter(Store.indsLclsCd.isnot(None)).group_by(
+            Store.indsLclsCd, Store.indsLclsNm,
+            Store.indsMclsCd, Store.indsMclsNm,
+            Store.indsSclsCd, Store.indsSclsNm
+        ).all()
+
+        root = UpjongNode("")
+        for lcls_cd, lcls_nm, mcls_cd, mcls_nm, scls_cd, scls_nm, count in rows:
+            if not lcls_cd:
+                continue
+            root.count += count
+            large = root.children.setdefault(lcls_cd, UpjongNode(lcls_cd))
+            large.add(lcls_nm, count)
+            if not mcls_cd:
+                continue
+            middle = large.children.setdefault(mcls_cd, UpjongNode(mcls_cd))
+            middle.add(mcls_nm, count)
+            if not scls_cd:
+                continue
+            middle.children.setdefault(scls_cd, UpjongNode(scls_cd)).add(scls_nm, count)
+
+        with self._lock:
+            self._root = root
+            self._version = version
+        logger.info(f"업종 분류 트리 갱신: 대분류 {len(root.children)}개, 상가 {root.count}건")
+        return root
+
+    def schedule_refresh(self) -> bool:
+        """백그라운드 재생성 시작 (이미 재생성 중이면 무시)"""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name="upjong-hierarchy-refresh", daemon=True).start()
+        return True
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh_in_new_session()
+        except Exception as e:
+            logger.warning(f"업종 분류 트리 갱신 실패: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get_root(self, db: Session) -> UpjongNode:
+        """현재 트리 (데이터 버전이 바뀌었으면 백그라운드 재생성을 시작하고 이전 트리 반환)"""
+        with self._lock:
+            root = self._root
+            stale = root is not None and self._version < count_cache.version
+        if stale:
+            self.schedule_refresh()
+        if root is not None:
+            return root
+
+        with self._build_lock:
+            # 기다리는 동안 다른 요청이 만들었으면 그대로 사용
+            return self._root if self._root is not None else self._build(db, count_cache.version)
+
+    def large(self, db: Session) -> List[UpjongNode]:
+        """대분류 목록"""
+        return self.get_root(db).sorted_children()
+
+    def middle(self, db: Session, lcls_cd: str) -> List[UpjongNode]:
+        """대분류 아래 중분류 목록"""
+        large = self.get_root(db).children.get(lcls_cd)
+        return large.sorted_children() if large else []
+
+    def small(self, db: Session, lcls_cd: str, mcls_cd: str) -> List[UpjongNode]:
+        """중분류 아래 소분류 목록"""
+        large = self.get_root(db).children.get(lcls_cd)
+        middle = large.children.get(mcls_cd) if large else None
+        return middle.sorted_children() if middle else []
+
+# 공용 업종 분류 트리
+upjong_hierarchy = UpjongHierarchy()